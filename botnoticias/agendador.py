@@ -0,0 +1,243 @@
+"""
+Modo daemon: um processo só que roda o relatório diário (main.py) e o das
+fontes oficiais (main_gov.py), cada um no seu horário (expressões cron).
+
+Entre as execuções ficam abertos o cliente do Gemini (e o event loop em que
+ele roda), a sessão HTTP com o pool de conexões, os navegadores do ONS, os
+processos de renderização dos PDFs (com estilos, fundo e cache de
+parágrafos) e o limitador de RPM/TPM. As datas da busca são recalculadas a
+cada execução, e cada uma gera o seu relatório de métricas.
+
+As tarefas rodam uma de cada vez: se uma atrasar, a outra começa logo
+depois. Horários perdidos durante uma execução longa não se acumulam.
+
+Uso:
+    python agendador.py                                   # AGENDA_MAIN e AGENDA_GOV do .env
+    python agendador.py --main "0 7 * * *" --gov "30 7 * * *"
+    python agendador.py --agora                           # roda as duas ao subir
+    python agendador.py --status                          # próxima e última execução
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from croniter import croniter
+
+from checkpoint import escrever_atomico
+from config import AGENDA_GOV, AGENDA_MAIN, ARQUIVO_STATUS_AGENDADOR, janela_datas
+from metricas import METRICAS
+from renderizacao import ServicoRenderizacao
+
+
+def _iso(momento):
+    return momento.isoformat(timespec="seconds") if momento else None
+
+
+class Tarefa:
+    """
+    Uma execução periódica. 'executar' recebe a própria tarefa (para saber,
+    por exemplo, se a última execução de hoje falhou).
+    """
+
+    def __init__(self, nome, agenda, executar):
+        if not croniter.is_valid(agenda):
+            raise ValueError(f"agenda inválida para {nome}: {agenda!r}")
+        self.nome = nome
+        self.agenda = agenda
+        self.executar = executar
+        self.proxima = None
+        self.ultima = {}  # início, fim, duração, resultado e erro da última execução
+        self.execucoes = 0
+        self.falhas = 0
+
+    def agendar(self, depois_de):
+        self.proxima = croniter(self.agenda, depois_de).get_next(datetime)
+
+    def falhou_hoje(self):
+        return (self.ultima.get("resultado") == "erro"
+                and self.ultima["inicio"][:10] == datetime.now().date().isoformat())
+
+    def status(self):
+        return {"agenda": self.agenda, "proxima": _iso(self.proxima),
+                "execucoes": self.execucoes, "falhas": self.falhas, "ultima": self.ultima}
+
+
+class Agendador:
+    """Roda as tarefas nos seus horários até receber SIGTERM ou Ctrl+C."""
+
+    def __init__(self, tarefas, arquivo_status=ARQUIVO_STATUS_AGENDADOR):
+        self.tarefas = tarefas
+        self.arquivo_status = arquivo_status
+        self.parar = threading.Event()
+        self.iniciado_em = datetime.now()
+        self.encerrado_em = None
+        self.em_execucao = None
+
+    def gravar_status(self):
+        escrever_atomico(self.arquivo_status, json.dumps({
+            "pid": os.getpid(),
+            "iniciado_em": _iso(self.iniciado_em),
+            "encerrado_em": _iso(self.encerrado_em),
+            "atualizado_em": _iso(datetime.now()),
+            "em_execucao": self.em_execucao,
+            "tarefas": {tarefa.nome: tarefa.status() for tarefa in self.tarefas},
+        }, ensure_ascii=False, indent=2))
+
+    def executar(self, tarefa):
+        inicio, relogio = datetime.now(), time.perf_counter()
+        self.em_execucao = tarefa.nome
+        self.gravar_status()
+        print(f"⏰ {tarefa.nome}: iniciando ({_iso(inicio)})")
+
+        METRICAS.reiniciar()  # Cada execução tem o seu relatório de métricas
+        resultado, erro = "ok", None
+        try:
+            tarefa.executar(tarefa)
+        except Exception as e:
+            # Uma execução com erro não derruba o agendador
+            resultado, erro = "erro", f"{type(e).__name__}: {e}"
+            tarefa.falhas += 1
+            traceback.print_exc()
+        finally:
+            METRICAS.salvar(tarefa.nome)
+
+        duracao = time.perf_counter() - relogio
+        tarefa.execucoes += 1
+        tarefa.ultima = {"inicio": _iso(inicio), "fim": _iso(datetime.now()),
+                         "duracao_segundos": round(duracao, 1), "resultado": resultado,
+                         "erro": erro}
+        # A partir de agora: horários que passaram durante a execução não se acumulam
+        tarefa.agendar(datetime.now())
+        self.em_execucao = None
+        self.gravar_status()
+        print(f"{'✅' if resultado == 'ok' else '❌'} {tarefa.nome}: {resultado} em {duracao:.1f}s"
+              f" | próxima: {_iso(tarefa.proxima)}")
+
+    def rodar(self, agora=False):
+        inicio = datetime.now()
+        for tarefa in self.tarefas:
+            tarefa.agendar(inicio)
+            if agora:
+                tarefa.proxima = inicio
+        self.gravar_status()
+        for tarefa in self.tarefas:
+            print(f"🗓️ {tarefa.nome} ({tarefa.agenda}): próxima às {_iso(tarefa.proxima)}")
+
+        while not self.parar.is_set():
+            tarefa = min(self.tarefas, key=lambda t: t.proxima)
+            espera = (tarefa.proxima - datetime.now()).total_seconds()
+            if espera > 0:
+                # Acorda pelo menos a cada minuto (relógio ajustado, suspensão da máquina)
+                self.parar.wait(min(espera, 60))
+                continue
+            self.executar(tarefa)
+
+
+def _tarefa_main(loop, servico):
+    def executar(tarefa):
+        from pipeline import executar_pipeline
+
+        de, ate = janela_datas()
+        print(f"📅 Buscando notícias de {de} a {ate}")
+        # Depois de uma falha hoje, retoma dos checkpoints em vez de refazer tudo
+        loop.run_until_complete(executar_pipeline(
+            max_por_query=7, debug=True, retomar=tarefa.falhou_hoje(), servico=servico))
+    return executar
+
+
+def _tarefa_gov(incremental):
+    def executar(tarefa):
+        from main_gov import gerar_relatorio
+        gerar_relatorio(incremental=incremental)
+    return executar
+
+
+def aquecer(servico):
+    """Prepara de uma vez o que cada execução avulsa pagaria ao começar."""
+    import http_client
+    import ia_filter  # noqa: F401 (cria o cliente do Gemini)
+    import pipeline  # noqa: F401
+
+    http_client.get_sessao()
+    servico.aquecer()
+
+
+def mostrar_status(arquivo=ARQUIVO_STATUS_AGENDADOR):
+    if not os.path.exists(arquivo):
+        print(f"Agendador nunca rodou (sem {arquivo}).")
+        return
+    with open(arquivo, encoding="utf-8") as f:
+        status = json.load(f)
+    if status["encerrado_em"]:
+        print(f"Agendador parado desde {status['encerrado_em']}")
+    else:
+        try:
+            os.kill(status["pid"], 0)
+            print(f"Agendador rodando (pid {status['pid']}, desde {status['iniciado_em']})")
+        except OSError:
+            print(f"Agendador parado sem encerrar (pid {status['pid']} não existe mais)")
+    if status["em_execucao"]:
+        print(f"Em execução: {status['em_execucao']}")
+    for nome, tarefa in status["tarefas"].items():
+        ultima = tarefa["ultima"]
+        if ultima:
+            texto_ultima = (f"{ultima['inicio']} ({ultima['resultado']}, "
+                            f"{ultima['duracao_segundos']}s)")
+            if ultima["erro"]:
+                texto_ultima += f" {ultima['erro']}"
+        else:
+            texto_ultima = "-"
+        print(f"- {nome} [{tarefa['agenda']}]: próxima {tarefa['proxima']} | última {texto_ultima}"
+              f" | {tarefa['execucoes']} execuções, {tarefa['falhas']} falhas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--main", default=AGENDA_MAIN, help="cron do relatório diário (main.py)")
+    parser.add_argument("--gov", default=AGENDA_GOV, help="cron das fontes oficiais (main_gov.py)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="fontes oficiais só com o que é novo desde a última execução")
+    parser.add_argument("--agora", action="store_true", help="roda as duas tarefas ao subir")
+    parser.add_argument("--status", action="store_true",
+                        help="mostra a próxima e a última execução de cada tarefa e sai")
+    args = parser.parse_args()
+
+    if args.status:
+        mostrar_status()
+        return
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    servico = ServicoRenderizacao()
+    try:
+        tarefas = [Tarefa("main", args.main, _tarefa_main(loop, servico)),
+                   Tarefa("main_gov", args.gov, _tarefa_gov(args.incremental))]
+    except ValueError as e:
+        parser.error(str(e))
+    agendador = Agendador(tarefas)
+    # SIGTERM (systemd, docker stop) encerra depois da execução em andamento
+    signal.signal(signal.SIGTERM, lambda *_: agendador.parar.set())
+
+    try:
+        aquecer(servico)
+        agendador.rodar(agora=args.agora)
+    except KeyboardInterrupt:
+        print("\n⏹️ Interrompido.")
+    finally:
+        servico.fechar()
+        loop.close()
+        agendador.em_execucao = None
+        agendador.encerrado_em = datetime.now()
+        agendador.gravar_status()
+    print("👋 Agendador encerrado.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from config import CAMINHO_BANCO
+from noticia import normalizar_link
+
+# Campos preenchidos pela classificação da IA (ia_filter.classificar_em_fluxo)
+CAMPOS_IA = ("relevante", "resumo", "categoria", "regiao")
+# Resumo usado por ia_filter quando todas as tentativas falham
+RESUMO_ERRO_IA = "Erro na análise"
+
+
+def _foi_classificada(noticia):
+    """True se a notícia tem uma análise válida da IA (e não o fallback de erro)."""
+    return (noticia.relevante is not None and bool(noticia.resumo)
+            and noticia.resumo != RESUMO_ERRO_IA)
+
+
+class ArmazemNoticias:
+    """
+    Guarda em SQLite as notícias já vistas e a classificação da IA, para que
+    execuções seguintes não mandem de novo para o Gemini o que já foi analisado.
+    """
+
+    def __init__(self, caminho=CAMINHO_BANCO):
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS noticias (
+                link TEXT PRIMARY KEY,
+                dados TEXT NOT NULL,
+                classificada INTEGER NOT NULL DEFAULT 0,
+                visto_em TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def fechar(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def aplicar_classificacoes(self, noticias):
+        """
+        Copia a classificação já salva para as notícias conhecidas e retorna
+        a lista das que ainda precisam passar pela IA.
+        """
+        links = [n.chave for n in noticias]
+        salvas = {}
+        with self._lock:
+            # Consulta em blocos para não estourar o limite de parâmetros do SQLite
+            for i in range(0, len(links), 500):
+                bloco = links[i:i + 500]
+                marcadores = ",".join("?" * len(bloco))
+                for link, dados in self._conn.execute(
+                        f"SELECT link, dados FROM noticias WHERE classificada = 1 AND link IN ({marcadores})",
+                        bloco):
+                    salvas[link] = json.loads(dados)
+
+        pendentes = []
+        for noticia, link in zip(noticias, links):
+            dados = salvas.get(link)
+            if dados:
+                for campo in CAMPOS_IA:
+                    if campo in dados:
+                        setattr(noticia, campo, dados[campo])
+            else:
+                pendentes.append(noticia)
+
+        print(
+            f"🗄️ {len(noticias) - len(pendentes)} notícias já classificadas em execuções anteriores.")
+        return pendentes
+
+    def aplicar_classificacao(self, noticia):
+        """Versão de 'aplicar_classificacoes' para uma notícia; True se já estava classificada."""
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT dados FROM noticias WHERE classificada = 1 AND link = ?",
+                (noticia.chave,)).fetchone()
+        if not linha:
+            return False
+        dados = json.loads(linha[0])
+        for campo in CAMPOS_IA:
+            if campo in dados:
+                setattr(noticia, campo, dados[campo])
+        return True
+
+    def salvar(self, noticias):
+        """Grava (ou atualiza) as notícias, marcando as que já têm análise da IA."""
+        agora = datetime.now().isoformat(timespec="seconds")
+        linhas = [
+            (n.chave, n.para_json(), int(_foi_classificada(n)), agora)
+            for n in noticias if n.chave
+        ]
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO noticias (link, dados, classificada, visto_em) VALUES (?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    dados = CASE WHEN excluded.classificada >= noticias.classificada
+                                 THEN excluded.dados ELSE noticias.dados END,
+                    classificada = MAX(noticias.classificada, excluded.classificada),
+                    visto_em = excluded.visto_em
+            """, linhas)
+            self._conn.commit()
+
+
+class MarcasDagua:
+    """
+    Guarda, para cada fonte paginada, a data da notícia mais recente já
+    coletada e os links daquele dia. A próxima coleta incremental para assim
+    que chegar nessa data, sem baixar as páginas mais antigas.
+    """
+
+    def __init__(self, caminho=CAMINHO_BANCO):
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS marcas_fontes (
+                fonte TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                links TEXT NOT NULL,
+                atualizado_em TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def fechar(self):
+        self._conn.close()
+
+    def obter(self, fonte):
+        """Retorna (data, conjunto de links normalizados) ou None se a fonte nunca foi coletada."""
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT data, links FROM marcas_fontes WHERE fonte = ?", (fonte,)).fetchone()
+        if not linha:
+            return None
+        return datetime.strptime(linha[0], "%Y-%m-%d").date(), set(json.loads(linha[1]))
+
+    def atualizar(self, fonte, data, links):
+        """Avança a marca da fonte; datas anteriores à marca atual são ignoradas."""
+        links = {normalizar_link(link) for link in links if link}
+        atual = self.obter(fonte)
+        if atual:
+            if data < atual[0]:
+                return
+            if data == atual[0]:
+                links |= atual[1]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO marcas_fontes VALUES (?, ?, ?, ?)",
+                (fonte, data.isoformat(), json.dumps(sorted(links)),
+                 datetime.now().isoformat(timespec="seconds")))
+            self._conn.commit()
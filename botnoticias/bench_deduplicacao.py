@@ -0,0 +1,95 @@
+"""
+Benchmark da deduplicação de títulos: varredura linear com SequenceMatcher
+(lista comum) versus IndiceTitulos.
+
+Uso:
+    python bench_deduplicacao.py                 # 1k, 10k e 100k títulos
+    python bench_deduplicacao.py --tamanhos 1000 5000 --max-linear 5000
+"""
+import argparse
+import random
+import string
+import time
+
+from coleta import verificar_similaridade
+from deduplicacao import IndiceTitulos
+
+PALAVRAS_BASE = [
+    "energia", "solar", "eólica", "petróleo", "gás", "natural", "usina", "leilão",
+    "mineração", "minério", "ferro", "lítio", "ouro", "Piauí", "Nordeste", "Brasil",
+    "Petrobras", "ANEEL", "tarifa", "transmissão", "hidrogênio", "verde", "investimento",
+    "bilhões", "governo", "projeto", "parque", "linha", "produção", "recorde",
+]
+CONECTORES = ["de", "da", "do", "em", "no", "na", "para", "com", "e", "a", "o"]
+
+
+def gerar_titulos(quantidade, seed=42, taxa_duplicatas=0.2):
+    """
+    Gera títulos sintéticos no estilo das manchetes coletadas. Parte deles
+    são variações de títulos anteriores (mesma notícia em outro site).
+    """
+    rnd = random.Random(seed)
+    vocabulario = PALAVRAS_BASE + [
+        "".join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(4, 10)))
+        for _ in range(20000)
+    ]
+    titulos = []
+    for _ in range(quantidade):
+        if titulos and rnd.random() < taxa_duplicatas:
+            palavras = rnd.choice(titulos).split()
+            # Pequena variação: troca ou remove uma palavra
+            pos = rnd.randrange(len(palavras))
+            if rnd.random() < 0.5:
+                palavras[pos] = rnd.choice(CONECTORES)
+            elif len(palavras) > 3:
+                palavras.pop(pos)
+            titulos.append(" ".join(palavras))
+            continue
+        palavras = []
+        for _ in range(rnd.randint(6, 14)):
+            palavras.append(rnd.choice(
+                CONECTORES if rnd.random() < 0.3 else vocabulario))
+        titulos.append(" ".join(palavras).capitalize())
+    return titulos
+
+
+def medir(titulos, vistos):
+    """Executa o mesmo laço de coletar_noticias_por_categoria e mede o tempo."""
+    inicio = time.perf_counter()
+    duplicatas = 0
+    for titulo in titulos:
+        if verificar_similaridade(titulo, vistos, limite=0.85):
+            duplicatas += 1
+            continue
+        vistos.append(titulo)
+    return time.perf_counter() - inicio, duplicatas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+",
+                        default=[1000, 10000, 100000])
+    parser.add_argument("--max-linear", type=int, default=1000,
+                        help="Maior quantidade medida com a varredura linear (é quadrática).")
+    args = parser.parse_args()
+
+    print(f"{'títulos':>10} | {'linear (s)':>11} | {'índice (s)':>11} | "
+          f"{'dup. linear':>11} | {'dup. índice':>11}")
+    print("-" * 66)
+    for quantidade in args.tamanhos:
+        titulos = gerar_titulos(quantidade)
+
+        tempo_indice, dup_indice = medir(titulos, IndiceTitulos(limite=0.85))
+
+        tempo_linear = dup_linear = "-"
+        if quantidade <= args.max_linear:
+            segundos, dup_linear = medir(titulos, [])
+            tempo_linear = f"{segundos:.2f}"
+
+        print(f"{quantidade:>10} | {tempo_linear:>11} | {tempo_indice:>11.2f} | "
+              f"{dup_linear:>11} | {dup_indice:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark do parsing das listagens oficiais sobre as páginas salvas em
+fixtures/: parser puro Python na página inteira (como era), lxml na página
+inteira e lxml materializando só os blocos da listagem (SoupStrainer).
+
+Uso:
+    python bench_parsing.py                  # 50 repetições por fonte
+    python bench_parsing.py --repeticoes 200
+"""
+import argparse
+import os
+import time
+from datetime import date
+
+from bs4 import BeautifulSoup
+
+import coleta_aneel
+import coleta_epe
+import coleta_mme
+import coleta_ons
+import coleta_petrobras
+import parsing
+
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Data fixa para o filtro de 7 dias do ONS dar sempre o mesmo resultado
+HOJE = date(2025, 10, 17)
+
+# nome -> (módulo, fixture, função que extrai as notícias do HTML)
+FONTES = {
+    "MME": (coleta_mme, "mme/noticias.html", coleta_mme.extrair_pagina_mme),
+    "ANEEL": (coleta_aneel, "aneel/noticias.html", coleta_aneel.extrair_pagina_aneel),
+    "EPE": (coleta_epe, "epe/noticias.html", coleta_epe.extrair_pagina_epe),
+    "Petrobras": (coleta_petrobras, "petrobras/mais-recentes.html",
+                  coleta_petrobras.extrair_pagina_petrobras),
+    "ONS": (coleta_ons, "ons/noticias_renderizada.html",
+            lambda html: coleta_ons.extrair_noticias_html(html, HOJE)),
+}
+
+
+def _pagina_inteira(parser):
+    """Variante de parsing.sopa que ignora o filtro de subárvore."""
+    def montar(html, tag=None, classe=None):
+        return BeautifulSoup(html, parser)
+    return montar
+
+
+VARIANTES = {
+    "html.parser": _pagina_inteira("html.parser"),
+    "lxml": _pagina_inteira(parsing.PARSER_HTML),
+    "lxml+strainer": parsing.sopa,
+}
+
+
+def medir(modulo, extrair, html, variante, repeticoes):
+    """Tempo médio (ms) de uma extração usando a variante de parsing indicada."""
+    original = modulo.sopa
+    modulo.sopa = VARIANTES[variante]
+    try:
+        resultado = extrair(html)
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            extrair(html)
+        return (time.perf_counter() - inicio) * 1000 / repeticoes, resultado
+    finally:
+        modulo.sopa = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    if parsing.PARSER_HTML != "lxml":
+        print("Aviso: lxml não está instalado; as colunas 'lxml' usam html.parser.\n")
+
+    print(f"{'fonte':>10} | {'KB':>5} | {'itens':>5} | " +
+          " | ".join(f"{nome:>13}" for nome in VARIANTES) + " | mesma saída")
+    print("-" * 86)
+    for nome, (modulo, arquivo, extrair) in FONTES.items():
+        with open(os.path.join(PASTA_FIXTURES, arquivo), encoding="utf-8") as f:
+            html = f.read()
+
+        tempos, saidas = [], []
+        for variante in VARIANTES:
+            ms, resultado = medir(modulo, extrair, html, variante, args.repeticoes)
+            tempos.append(ms)
+            saidas.append(resultado)
+
+        iguais = "sim" if all(saida == saidas[0] for saida in saidas) else "NÃO"
+        print(f"{nome:>10} | {len(html) // 1024:>5} | {len(saidas[0]):>5} | " +
+              " | ".join(f"{ms:>10.2f} ms" for ms in tempos) + f" | {iguais}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+"""
+Benchmark offline do fluxo completo, sem rede e sem chamar o Gemini. Mede
+cada etapa separadamente:
+
+- coleta: os coletores reais (NewsAPI, GNews, Google News e as fontes
+  oficiais) lendo as respostas gravadas em fixtures/, com latência HTTP
+  simulada;
+- deduplicacao: coletar_em_fluxo sobre notícias sintéticas;
+- classificacao: a orquestração de classificar_em_fluxo (lotes, concorrência,
+  reconciliação) com um Gemini falso de latência e tokens configuráveis;
+- pdf: gerar_pdf com notícias sintéticas já classificadas;
+- relatorios: os três relatórios do main.py (bruto, Energia e Mineração),
+  um depois do outro (sequencial) e no ServicoRenderizacao (paralelo).
+
+Cada medição é anexada a dados/bench/resultados.jsonl com o commit atual e
+comparada com a última medição de um commit diferente.
+
+Uso:
+    python bench_pipeline.py                                   # 100, 1k e 10k notícias
+    python bench_pipeline.py --tamanhos 100 1000 --etapas deduplicacao pdf
+    python bench_pipeline.py --latencia-gemini 0.8 --latencia-http 0.05
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from functools import partial
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PASTA_FIXTURES = os.path.join(PASTA, "fixtures")
+ARQUIVO_RESULTADOS = os.path.join(PASTA, "dados", "bench", "resultados.jsonl")
+
+# O benchmark não pode tocar no banco, nos caches nem nas chaves reais
+os.environ["BOTNOTICIAS_DADOS"] = tempfile.mkdtemp(prefix="bench-botnoticias-")
+os.environ.setdefault("GEMINI_API_KEY", "offline")
+
+import requests  # noqa: E402
+
+import coleta  # noqa: E402
+import http_client  # noqa: E402
+import ia_filter  # noqa: E402
+from bench_deduplicacao import gerar_titulos  # noqa: E402
+from config import GEMINI_MAX_LOTES_SIMULTANEOS, QUERIES, RENDER_PROCESSOS  # noqa: E402
+from executor_fontes import executar_fontes  # noqa: E402
+from fontes_gov import FONTES_GOV  # noqa: E402
+from noticia import Noticia  # noqa: E402
+from pdf_generator import caminho_relatorio, gerar_pdf  # noqa: E402
+from rate_limit import LimitadorTokens  # noqa: E402
+from renderizacao import TrabalhoPDF, renderizar_relatorios  # noqa: E402
+
+ETAPAS = ("coleta", "deduplicacao", "classificacao", "pdf", "relatorios")
+
+# Prefixo da URL -> (fixture, Content-Type). Só a primeira página das
+# listagens paginadas tem fixture; as seguintes voltam vazias.
+ROTAS = [
+    ("https://newsapi.org/", "newsapi/everything.json", "application/json"),
+    ("https://gnews.io/", "gnews/search.json", "application/json"),
+    ("https://www.gov.br/mme/", "mme/noticias.html", "text/html"),
+    ("https://www.gov.br/aneel/", "aneel/noticias.html", "text/html"),
+    ("https://www.epe.gov.br/", "epe/noticias.html", "text/html"),
+    ("https://agencia.petrobras.com.br/", "petrobras/mais-recentes.html", "text/html"),
+    ("https://www.ons.org.br/", "ons/noticias_api.json", "application/json"),
+]
+# Intervalo das datas das fixtures (backfill das fontes oficiais paginadas)
+PERIODO_FIXTURES = (date(2025, 9, 1), date(2025, 10, 17))
+
+
+def _ler_fixture(nome):
+    with open(os.path.join(PASTA_FIXTURES, nome), "rb") as f:
+        return f.read()
+
+
+class ReprodutorHTTP:
+    """Substitui http_client.get: responde com as fixtures depois de 'latencia' segundos."""
+
+    def __init__(self, latencia=0.0):
+        self.latencia = latencia
+        self.requisicoes = 0
+        self._corpos = {prefixo: (_ler_fixture(nome), tipo) for prefixo, nome, tipo in ROTAS}
+
+    def __call__(self, url, params=None, timeout=None, **kwargs):
+        self.requisicoes += 1
+        time.sleep(self.latencia)
+        resp = requests.Response()
+        resp.url = url
+        resp.encoding = "utf-8"
+        resp.from_cache = False
+        for prefixo, (corpo, tipo) in self._corpos.items():
+            if url.startswith(prefixo):
+                primeira_pagina = "b_start" not in url
+                resp.status_code = 200
+                resp.headers["Content-Type"] = tipo
+                resp._content = corpo if primeira_pagina else b"<html><body></body></html>"
+                return resp
+        resp.status_code = 404
+        resp._content = b""
+        return resp
+
+
+class GoogleNewsGravado:
+    """Substitui a classe GoogleNews devolvendo os resultados gravados."""
+
+    resultados = json.loads(_ler_fixture("google_news/resultados.json"))
+    latencia = 0.0
+
+    def __init__(self, **kwargs):
+        pass
+
+    def search(self, query):
+        time.sleep(GoogleNewsGravado.latencia)
+
+    def results(self):
+        return [dict(item) for item in self.resultados]
+
+
+class _Uso:
+    def __init__(self, entrada, saida):
+        self.prompt_token_count = entrada
+        self.candidates_token_count = saida
+        self.total_token_count = entrada + saida
+
+
+class _Resposta:
+    def __init__(self, texto, uso):
+        self.text = texto
+        self.usage_metadata = uso
+
+
+class GeminiFalso:
+    """
+    Responde como o Gemini ao prompt de ia_filter: uma análise válida por
+    'ID n:' do lote, depois de 'latencia' segundos. Conta chamadas e tokens.
+    """
+
+    _ID = re.compile(r"^\s*ID (\d+):", re.MULTILINE)
+
+    def __init__(self, latencia=0.5, tokens_saida_por_item=40, taxa_relevantes=0.3, seed=42):
+        self.latencia = latencia
+        self.tokens_saida_por_item = tokens_saida_por_item
+        self.taxa_relevantes = taxa_relevantes
+        self.chamadas = 0
+        self._rnd = random.Random(seed)
+        self.models = self
+        self.aio = self
+
+    def _responder(self, contents):
+        self.chamadas += 1
+        ids = [int(i) for i in self._ID.findall(contents)]
+        analises = [{
+            "id_original": i,
+            "relevante": self._rnd.random() < self.taxa_relevantes,
+            "resumo": "Resumo gerado pelo benchmark.",
+            "categoria": self._rnd.choice(["Energia", "Mineração"]),
+            "regiao": self._rnd.choice(["Piauí", "Nordeste", "Brasil", "Mundo"]),
+        } for i in ids]
+        uso = _Uso(len(contents) // 4, self.tokens_saida_por_item * len(ids))
+        return _Resposta(json.dumps(analises, ensure_ascii=False), uso)
+
+    async def generate_content(self, model, contents, config):
+        await asyncio.sleep(self.latencia)
+        return self._responder(contents)
+
+
+def gerar_noticias(quantidade, seed=42, classificadas=False):
+    """Notícias sintéticas (com ~20% de quase-duplicatas de título), mais novas primeiro."""
+    rnd = random.Random(seed)
+    hoje = date(2025, 10, 17)
+    noticias = []
+    for i, titulo in enumerate(gerar_titulos(quantidade, seed=seed)):
+        noticia = Noticia(
+            titulo=titulo,
+            link=f"https://portal{rnd.randrange(50)}.com.br/noticia/{i}",
+            fonte=f"Portal {rnd.randrange(50)}",
+            fonte_id=rnd.choice(["newsapi", "gnews", "google_news"]),
+            data=hoje - timedelta(days=rnd.randrange(7)),
+            descricao=" ".join(titulo.split()[:12]),
+        )
+        if classificadas:
+            noticia.relevante = True
+            noticia.resumo = f"{titulo}. " * 2
+            noticia.categoria = rnd.choice(["Energia", "Mineração"])
+            noticia.regiao = rnd.choice(["Piauí", "Nordeste", "Brasil", "Mundo"])
+        noticias.append(noticia)
+    return noticias
+
+
+@contextlib.contextmanager
+def _silencio():
+    """Descarta os prints dos módulos durante a medição."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def medir_coleta(args):
+    reprodutor = ReprodutorHTTP(args.latencia_http)
+    GoogleNewsGravado.latencia = args.latencia_http
+    http_original, google_original = http_client.get, coleta.GoogleNews
+    http_client.get, coleta.GoogleNews = reprodutor, GoogleNewsGravado
+    try:
+        with _silencio():
+            inicio = time.perf_counter()
+            noticias = list(coleta.coletar_em_fluxo(max_por_query=7))
+            segundos_apis = time.perf_counter() - inicio
+
+            desde, ate = PERIODO_FIXTURES
+            fontes = {nome: partial(fonte, desde=desde, ate=ate) if fonte.paginada else fonte
+                      for nome, fonte in FONTES_GOV.items()}
+            inicio = time.perf_counter()
+            resultados, _ = executar_fontes(fontes)
+            segundos_gov = time.perf_counter() - inicio
+    finally:
+        http_client.get, coleta.GoogleNews = http_original, google_original
+
+    return [
+        {"etapa": "coleta", "variante": "apis", "tamanho": len(noticias),
+         "segundos": segundos_apis, "requisicoes": reprodutor.requisicoes},
+        {"etapa": "coleta", "variante": "oficiais",
+         "tamanho": sum(len(itens) for itens in resultados.values()), "segundos": segundos_gov},
+    ]
+
+
+def medir_deduplicacao(tamanho):
+    noticias = gerar_noticias(tamanho)
+    consultas = [query for queries in QUERIES.values() for query in queries]
+    por_query = {query: noticias[i::len(consultas)] for i, query in enumerate(consultas)}
+
+    def fonte_sintetica(query):
+        return list(por_query[query])
+
+    fonte_sintetica.__name__ = "get_newsapi"
+    fontes_originais = coleta.FONTES
+    coleta.FONTES = [fonte_sintetica]
+    try:
+        with _silencio():
+            inicio = time.perf_counter()
+            unicas = list(coleta.coletar_em_fluxo(max_por_query=tamanho, paralelo=False))
+            segundos = time.perf_counter() - inicio
+    finally:
+        coleta.FONTES = fontes_originais
+    return {"etapa": "deduplicacao", "tamanho": tamanho, "segundos": segundos,
+            "descartadas": tamanho - len(unicas)}
+
+
+def medir_classificacao(tamanho, args):
+    noticias = gerar_noticias(tamanho)
+    gemini = GeminiFalso(args.latencia_gemini, args.tokens_saida)
+    cliente_original, limitador_original = ia_filter.client, ia_filter.LIMITADOR
+    ia_filter.client = gemini
+    ia_filter.LIMITADOR = LimitadorTokens(rpm=args.rpm, tpm=args.tpm)
+
+    async def consumir():
+        resultados = 0
+        async for _ in ia_filter.classificar_em_fluxo(
+                noticias, max_simultaneos=args.lotes_simultaneos):
+            resultados += 1
+        return resultados
+
+    try:
+        with _silencio():
+            inicio = time.perf_counter()
+            resultados = asyncio.run(consumir())
+            segundos = time.perf_counter() - inicio
+    finally:
+        ia_filter.client, ia_filter.LIMITADOR = cliente_original, limitador_original
+    return {"etapa": "classificacao", "tamanho": tamanho, "segundos": segundos,
+            "chamadas": gemini.chamadas, "resultados": resultados,
+            "segundos_por_chamada_simulada": args.latencia_gemini}
+
+
+def medir_pdf(tamanho):
+    noticias = gerar_noticias(tamanho, classificadas=True)
+    nome = f"bench_{tamanho}.pdf"
+    caminho = caminho_relatorio(nome)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    try:
+        with _silencio():
+            inicio = time.perf_counter()
+            gerar_pdf(noticias, nome, categoria="Energia")
+            segundos = time.perf_counter() - inicio
+        tamanho_arquivo = os.path.getsize(caminho)
+    finally:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+    return {"etapa": "pdf", "tamanho": tamanho, "segundos": segundos, "bytes": tamanho_arquivo}
+
+
+def medir_relatorios(tamanho):
+    noticias = gerar_noticias(tamanho, classificadas=True)
+    trabalhos = [TrabalhoPDF(noticias, f"bench_bruto_{tamanho}.pdf")] + [
+        TrabalhoPDF([n for n in noticias if n.categoria == categoria],
+                    f"bench_{categoria}_{tamanho}.pdf", categoria)
+        for categoria in ("Energia", "Mineração")
+    ]
+    medicoes = []
+    try:
+        with _silencio():
+            inicio = time.perf_counter()
+            for trabalho in trabalhos:
+                gerar_pdf(trabalho.noticias, trabalho.nome_arquivo, trabalho.categoria)
+            medicoes.append({"etapa": "relatorios", "variante": "sequencial", "tamanho": tamanho,
+                             "segundos": time.perf_counter() - inicio})
+
+            # Inclui a subida dos processos, como no main.py
+            inicio = time.perf_counter()
+            renderizar_relatorios(trabalhos)
+            medicoes.append({"etapa": "relatorios", "variante": "paralelo", "tamanho": tamanho,
+                             "segundos": time.perf_counter() - inicio,
+                             "processos": RENDER_PROCESSOS or os.cpu_count()})
+    finally:
+        for trabalho in trabalhos:
+            caminho = caminho_relatorio(trabalho.nome_arquivo)
+            if os.path.exists(caminho):
+                os.remove(caminho)
+    return medicoes
+
+
+def _commit_atual():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PASTA,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        sujo = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=PASTA,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "-"
+    return f"{commit}+alterado" if sujo else commit
+
+
+def _chave(medicao):
+    return (medicao["etapa"], medicao.get("variante", ""), medicao["tamanho"])
+
+
+def _anteriores(caminho, commit):
+    """Última medição de cada (etapa, variante, tamanho) feita em outro commit."""
+    anteriores = {}
+    if os.path.exists(caminho):
+        with open(caminho, encoding="utf-8") as f:
+            for linha in f:
+                medicao = json.loads(linha)
+                if medicao.get("commit") != commit:
+                    anteriores[_chave(medicao)] = medicao
+    return anteriores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=list(ETAPAS))
+    parser.add_argument("--max-pdf", type=int, default=1000,
+                        help="Maior quantidade de notícias renderizada no PDF.")
+    parser.add_argument("--latencia-http", type=float, default=0.0,
+                        help="Segundos simulados por requisição na coleta.")
+    parser.add_argument("--latencia-gemini", type=float, default=0.5,
+                        help="Segundos simulados por chamada ao Gemini.")
+    parser.add_argument("--tokens-saida", type=int, default=40,
+                        help="Tokens de saída por notícia informados pelo Gemini falso.")
+    parser.add_argument("--rpm", type=int, default=1_000_000,
+                        help="RPM do rate limit durante o benchmark (padrão: sem limite).")
+    parser.add_argument("--tpm", type=int, default=None)
+    parser.add_argument("--lotes-simultaneos", type=int, default=GEMINI_MAX_LOTES_SIMULTANEOS)
+    parser.add_argument("--saida", default=ARQUIVO_RESULTADOS,
+                        help="Arquivo JSONL onde as medições são acumuladas.")
+    args = parser.parse_args()
+
+    commit = _commit_atual()
+    anteriores = _anteriores(args.saida, commit)
+    medicoes = []
+    if "coleta" in args.etapas:
+        medicoes.extend(medir_coleta(args))
+    for tamanho in args.tamanhos:
+        if "deduplicacao" in args.etapas:
+            medicoes.append(medir_deduplicacao(tamanho))
+        if "classificacao" in args.etapas:
+            medicoes.append(medir_classificacao(tamanho, args))
+        if "pdf" in args.etapas and tamanho <= args.max_pdf:
+            medicoes.append(medir_pdf(tamanho))
+        if "relatorios" in args.etapas and tamanho <= args.max_pdf:
+            medicoes.extend(medir_relatorios(tamanho))
+
+    print(f"commit {commit}\n")
+    print(f"{'etapa':>14} | {'variante':>8} | {'notícias':>8} | {'tempo (s)':>9} | "
+          f"{'anterior (s)':>12} | {'variação':>8} | detalhes")
+    print("-" * 100)
+    agora = datetime.now().isoformat(timespec="seconds")
+    os.makedirs(os.path.dirname(args.saida), exist_ok=True)
+    with open(args.saida, "a", encoding="utf-8") as f:
+        for medicao in medicoes:
+            medicao.update(commit=commit, data=agora)
+            f.write(json.dumps(medicao, ensure_ascii=False) + "\n")
+
+            anterior = anteriores.get(_chave(medicao))
+            if anterior:
+                texto_anterior = f"{anterior['segundos']:.3f}"
+                variacao = f"{100 * (medicao['segundos'] / anterior['segundos'] - 1):+.0f}%"
+            else:
+                texto_anterior = variacao = "-"
+            detalhes = ", ".join(f"{chave}={valor}" for chave, valor in medicao.items()
+                                 if chave not in ("etapa", "variante", "tamanho", "segundos",
+                                                  "commit", "data"))
+            print(f"{medicao['etapa']:>14} | {medicao.get('variante', ''):>8} | "
+                  f"{medicao['tamanho']:>8} | {medicao['segundos']:>9.3f} | "
+                  f"{texto_anterior:>12} | {variacao:>8} | {detalhes}")
+    print(f"\nResultados acumulados em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark do fundo das páginas (images/template.png): tempo de renderização
+e tamanho do PDF conforme o número de páginas.
+
+- por página: ImageReader + drawImage a cada página (como era);
+- form: a imagem decodificada uma vez e desenhada num form XObject;
+- form+jpeg: idem, com a imagem recomprimida em JPEG (embutida sem decodificar);
+- form+jpeg reduzida: JPEG com largura máxima de 1000 px.
+
+Uso:
+    python bench_template.py                          # 1, 10, 50 e 200 páginas
+    python bench_template.py --paginas 10 300 --repeticoes 5
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+# As cópias recomprimidas do template vão para uma pasta temporária
+os.environ["BOTNOTICIAS_DADOS"] = tempfile.mkdtemp(prefix="bench-botnoticias-")
+
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.lib.utils import ImageReader  # noqa: E402
+from reportlab.pdfgen.canvas import Canvas  # noqa: E402
+
+from template_pdf import desenhar_template, imagem_template, img_path  # noqa: E402
+
+
+def _por_pagina(canvas):
+    canvas.drawImage(ImageReader(img_path), 0, 0, width=A4[0], height=A4[1])
+
+
+VARIANTES = {
+    "por página": _por_pagina,
+    "form": lambda canvas: desenhar_template(canvas, imagem_template(qualidade=0)),
+    "form+jpeg": lambda canvas: desenhar_template(canvas, imagem_template(qualidade=85)),
+    "form+jpeg reduzida": lambda canvas: desenhar_template(
+        canvas, imagem_template(largura_max=1000, qualidade=80)),
+}
+
+
+def renderizar(paginas, desenhar_fundo):
+    """Gera um PDF de 'paginas' páginas em memória; retorna o tamanho em bytes."""
+    saida = io.BytesIO()
+    canvas = Canvas(saida, pagesize=A4)
+    for pagina in range(1, paginas + 1):
+        canvas.saveState()
+        desenhar_fundo(canvas)
+        canvas.restoreState()
+        canvas.setFont("Helvetica", 11)
+        canvas.drawString(72, 400, f"Página {pagina}")
+        canvas.showPage()
+    canvas.save()
+    return len(saida.getvalue())
+
+
+def medir(paginas, desenhar_fundo, repeticoes):
+    renderizar(1, desenhar_fundo)  # Prepara a imagem fora da medição (uma vez por processo)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        tamanho = renderizar(paginas, desenhar_fundo)
+    return (time.perf_counter() - inicio) / repeticoes, tamanho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paginas", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'páginas':>8} | " + " | ".join(f"{nome:>24}" for nome in VARIANTES))
+    print("-" * (11 + 27 * len(VARIANTES)))
+    for paginas in args.paginas:
+        colunas = []
+        for desenhar_fundo in VARIANTES.values():
+            segundos, tamanho = medir(paginas, desenhar_fundo, args.repeticoes)
+            colunas.append(f"{segundos:>8.3f} s {tamanho / 1024:>9.0f} KB")
+        print(f"{paginas:>8} | " + " | ".join(f"{coluna:>24}" for coluna in colunas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from config import CAMINHO_CACHE_IA, CACHE_IA_TTL_DIAS, CACHE_IA_MAX_ITENS
+
+
+def chave_cache(modelo, versao_schema, titulo, fonte):
+    """Hash do que determina a resposta da IA para uma notícia."""
+    titulo_normalizado = re.sub(r"\s+", " ", (titulo or "").strip().lower())
+    fonte_normalizada = (fonte or "").strip().lower()
+    conteudo = json.dumps(
+        [modelo, versao_schema, titulo_normalizado, fonte_normalizada], ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+class CacheClassificacao:
+    """
+    Cache em disco (SQLite) das análises do Gemini, endereçado pelo conteúdo
+    da notícia. Entradas expiram após 'ttl_dias' e, acima de 'max_itens', as
+    menos usadas recentemente são descartadas.
+    """
+
+    def __init__(self, caminho=CAMINHO_CACHE_IA, ttl_dias=CACHE_IA_TTL_DIAS,
+                 max_itens=CACHE_IA_MAX_ITENS):
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        self.ttl_segundos = ttl_dias * 24 * 3600
+        self.max_itens = max_itens
+        self.acertos = 0
+        self.faltas = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS classificacoes (
+                chave TEXT PRIMARY KEY,
+                resultado TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                usado_em REAL NOT NULL
+            )
+        """)
+        self._remover_expirados()
+
+    def fechar(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def _remover_expirados(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM classificacoes WHERE criado_em < ?",
+                               (time.time() - self.ttl_segundos,))
+            self._conn.commit()
+
+    def obter(self, chave):
+        """Retorna o resultado salvo (dict) ou None, contabilizando acerto/falta."""
+        agora = time.time()
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT resultado FROM classificacoes WHERE chave = ? AND criado_em >= ?",
+                (chave, agora - self.ttl_segundos)).fetchone()
+            if linha:
+                self.acertos += 1
+                self._conn.execute(
+                    "UPDATE classificacoes SET usado_em = ? WHERE chave = ?", (agora, chave))
+                self._conn.commit()
+                return json.loads(linha[0])
+            self.faltas += 1
+            return None
+
+    def guardar(self, chave, resultado):
+        agora = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO classificacoes VALUES (?, ?, ?, ?)",
+                (chave, json.dumps(resultado, ensure_ascii=False), agora, agora))
+            # Despeja as entradas menos usadas quando passar do tamanho máximo
+            self._conn.execute("""
+                DELETE FROM classificacoes WHERE chave IN (
+                    SELECT chave FROM classificacoes ORDER BY usado_em DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_itens,))
+            self._conn.commit()
+
+    def resumo(self):
+        total = self.acertos + self.faltas
+        taxa = (100 * self.acertos / total) if total else 0
+        return f"💾 Cache IA: {self.acertos} acertos | {self.faltas} faltas ({taxa:.0f}% de acerto)"
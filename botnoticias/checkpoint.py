@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import List, Optional, Set
+
+from config import PASTA_CHECKPOINTS
+from noticia import Noticia
+
+def escrever_atomico(caminho, conteudo):
+    """
+    Grava o arquivo por inteiro ou não grava: escreve num temporário na
+    mesma pasta, força o disco e só então troca pelo definitivo. Quem lê
+    nunca vê um arquivo pela metade, mesmo se o processo cair no meio.
+    'conteudo' pode ser texto (gravado em UTF-8) ou bytes.
+    """
+    pasta = os.path.dirname(caminho) or "."
+    os.makedirs(pasta, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, prefix=".tmp-")
+    binario = isinstance(conteudo, bytes)
+    try:
+        # mkstemp cria com 0600; o arquivo final fica legível por todos, como um open() comum
+        os.chmod(temporario, 0o644)
+        with os.fdopen(descritor, "wb" if binario else "w",
+                       encoding=None if binario else "utf-8") as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+class CheckpointExecucao:
+    """
+    Checkpoints das etapas de uma execução diária do main.py, numa pasta
+    por data em dados/checkpoints/:
+
+    - coletadas.jsonl: as notícias como vieram da coleta;
+    - classificadas.jsonl: as que já têm análise (IA, banco, cache ou pré-filtro);
+    - renderizados.json: os PDFs terminados.
+
+    Cada arquivo é regravado inteiro de forma atômica, então um checkpoint
+    lido é sempre um estado completo de alguma etapa.
+    """
+
+    def __init__(self, pasta=PASTA_CHECKPOINTS, execucao=None):
+        self.execucao = execucao or datetime.now().strftime("%Y-%m-%d")
+        self.pasta = os.path.join(pasta, self.execucao)
+
+    def _caminho(self, nome):
+        return os.path.join(self.pasta, nome)
+
+    def limpar(self):
+        """Descarta os checkpoints desta execução (começa do zero)."""
+        if os.path.isdir(self.pasta):
+            for nome in os.listdir(self.pasta):
+                os.remove(self._caminho(nome))
+
+    def salvar_noticias(self, etapa: str, noticias: List[Noticia]):
+        escrever_atomico(self._caminho(f"{etapa}.jsonl"),
+                         "".join(n.para_json() + "\n" for n in noticias))
+
+    def carregar_noticias(self, etapa: str) -> Optional[List[Noticia]]:
+        """Notícias gravadas na etapa, ou None se ela não tem checkpoint."""
+        caminho = self._caminho(f"{etapa}.jsonl")
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, encoding="utf-8") as f:
+            return [Noticia.de_json(linha) for linha in f if linha.strip()]
+
+    def renderizados(self) -> Set[str]:
+        caminho = self._caminho("renderizados.json")
+        if not os.path.exists(caminho):
+            return set()
+        with open(caminho, encoding="utf-8") as f:
+            return set(json.load(f))
+
+    def marcar_renderizado(self, arquivo: str):
+        feitos = self.renderizados() | {arquivo}
+        escrever_atomico(self._caminho("renderizados.json"),
+                         json.dumps(sorted(feitos), ensure_ascii=False))
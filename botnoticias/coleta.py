@@ -1,9 +1,14 @@
-from datetime import datetime, timedelta
-import requests
-import re
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import http_client
 from difflib import SequenceMatcher  # Importação para comparar similaridade
 from GoogleNews import GoogleNews
-from config import NEWS_API_KEY, GNEWS_API_KEY, LANGUAGE, QUERIES, FROM_DATE, TO_DATE
+from deduplicacao import IndiceTitulos
+from metricas import METRICAS
+from noticia import Noticia
+from config import (NEWS_API_KEY, GNEWS_API_KEY, LANGUAGE, QUERIES, janela_datas,
+                    LIMITE_CONCORRENCIA_FONTES)
 
 # --- Funções Auxiliares ---
 
@@ -12,7 +17,13 @@ def verificar_similaridade(novo_titulo, lista_titulos, limite=0.85):
     """
     Verifica se o 'novo_titulo' é semelhante a algum item da 'lista_titulos'.
     Retorna True se encontrar similaridade acima do limite.
+
+    'lista_titulos' pode ser uma lista comum ou um IndiceTitulos, que só
+    compara com os candidatos plausíveis em vez de varrer todos os títulos.
     """
+    if isinstance(lista_titulos, IndiceTitulos):
+        return lista_titulos.contem_similar(novo_titulo, limite=limite)
+
     # Normaliza para minúsculas para melhorar a comparação
     novo_low = novo_titulo.lower()
 
@@ -27,12 +38,13 @@ def verificar_similaridade(novo_titulo, lista_titulos, limite=0.85):
 def get_newsapi(query):
     # Coloca a query entre aspas para busca exata
     query_encoded = f'"{query}"'
+    de, ate = janela_datas()
 
     params = {
         "q": query_encoded,
         "language": LANGUAGE,
-        "from": FROM_DATE,
-        "to": TO_DATE,
+        "from": de,
+        "to": ate,
         "sortBy": "publishedAt",
         "apiKey": NEWS_API_KEY
     }
@@ -40,7 +52,7 @@ def get_newsapi(query):
     url = "https://newsapi.org/v2/everything"
 
     try:
-        resp = requests.get(url, params=params)
+        resp = http_client.get(url, params=params)
         resp.raise_for_status()
         data = resp.json()
     except Exception as e:
@@ -49,61 +61,68 @@ def get_newsapi(query):
 
     artigos = []
     for art in data.get("articles", []):
-        artigos.append({
-            "fonte": art["source"]["name"],
-            "titulo": art.get("title") or "Sem título",
-            "descricao": art.get("description") or "",
-            "link": art["url"],
-            "data": art.get("publishedAt", "")[:10]  # YYYY-MM-DD
-        })
+        artigos.append(Noticia(
+            fonte=art["source"]["name"],
+            fonte_id="newsapi",
+            titulo=art.get("title") or "Sem título",
+            descricao=art.get("description") or "",
+            link=art["url"],
+            data=art.get("publishedAt")  # AAAA-MM-DDTHH:MM:SSZ
+        ))
     print(f"  → {len(artigos)} artigos encontrados em Newsapi.")
     return artigos
 
 
 def get_gnews(query):
-    url = (
-        f"https://gnews.io/api/v4/search?"
-        f"q={query}&lang={LANGUAGE}&from={FROM_DATE}&to={TO_DATE}"
-        f"&sortby=publishedAt&max=10&token={GNEWS_API_KEY}"
-    )
+    de, ate = janela_datas()
+    params = {
+        "q": query,
+        "lang": LANGUAGE,
+        "from": de,
+        "to": ate,
+        "sortby": "publishedAt",
+        "max": 10,
+        "token": GNEWS_API_KEY
+    }
+
+    url = "https://gnews.io/api/v4/search"
+
     try:
-        resp = requests.get(url).json()
+        resp = http_client.get(url, params=params).json()
     except Exception as e:
         print(f"   ⚠️ Erro na API GNews: {e}")
         return []
 
     artigos = []
     for art in resp.get("articles", []):
-        artigos.append({
-            "fonte": art["source"]["name"],
-            "titulo": art["title"],
-            "link": art["url"],
-            "data": art.get("publishedAt", "")[:10]
-        })
+        artigos.append(Noticia(
+            fonte=art["source"]["name"],
+            fonte_id="gnews",
+            titulo=art["title"],
+            link=art["url"],
+            data=art.get("publishedAt")
+        ))
     print(f"  → {len(artigos)} artigos encontrados em Gnews.")
     return artigos
 
 
 def normalizar_data_google(date_str):
+    """Converte a data relativa do Google News ('há 2 horas', 'ontem', 'DD/MM/AAAA') em date, ou None."""
     hoje = datetime.now().date()
 
     if not date_str:
-        return "Data desconhecida"
+        return None
 
     date_str = date_str.lower().strip()
 
+    if "hora" in date_str or "minuto" in date_str:
+        return hoje
+    if "ontem" in date_str:
+        return hoje - timedelta(days=1)
     try:
-        if "hora" in date_str or "minuto" in date_str:
-            return hoje.strftime("%Y-%m-%d")
-        elif "ontem" in date_str:
-            return (hoje - timedelta(days=1)).strftime("%Y-%m-%d")
-        else:
-            try:
-                return datetime.strptime(date_str, "%d/%m/%Y").strftime("%Y-%m-%d")
-            except ValueError:
-                return "Data desconhecida"
-    except Exception:
-        return "Data desconhecida"
+        return datetime.strptime(date_str, "%d/%m/%Y").date()
+    except ValueError:
+        return None
 
 
 def get_google_news(query):
@@ -123,64 +142,129 @@ def get_google_news(query):
     artigos = []
     for art in resultados:
         data_publicacao = normalizar_data_google(art.get("date"))
-        if data_publicacao == "Data desconhecida":
+        if data_publicacao is None:
             continue
 
         link = art.get("link", "#") or "#"
         if "&" in link:
             link = link.split("&")[0]
 
-        artigos.append({
-            "fonte": art.get("media", "Fonte desconhecida"),
-            "titulo": art.get("title", "Sem título"),
-            "link": link,
-            "data": data_publicacao
-        })
+        artigos.append(Noticia(
+            fonte=art.get("media", "Fonte desconhecida"),
+            fonte_id="google_news",
+            titulo=art.get("title", "Sem título"),
+            link=link,
+            data=data_publicacao
+        ))
 
     print(f"  → {len(artigos)} artigos encontrados em Google News.")
     return artigos
 
 
+# Ordem das fontes: define também a ordem em que os resultados entram na deduplicação
+FONTES = [get_newsapi, get_gnews, get_google_news]
+
+
+def _buscar_na_fonte(func, query):
+    """Executa uma fonte para uma query, sem deixar a exceção derrubar a coleta."""
+    try:
+        with METRICAS.cronometrar("coleta_fonte", fonte=func.__name__):
+            artigos = func(query)
+    except Exception as e:
+        print(f"   ⚠️ Erro em {func.__name__} ({query}): {e}")
+        METRICAS.incrementar("coleta_erros", fonte=func.__name__)
+        return []
+    METRICAS.incrementar("coleta_itens", len(artigos), fonte=func.__name__)
+    return artigos
+
+
+def buscar_em_paralelo_em_fluxo(consultas, limites=None):
+    """
+    Dispara todas as buscas query×fonte ao mesmo tempo, respeitando um limite
+    de requisições simultâneas por fonte.
+
+    Gera, na mesma ordem de 'consultas', os artigos de cada query já
+    concatenados na ordem de FONTES (igual à coleta sequencial). Cada query é
+    entregue assim que as buscas dela terminam, sem esperar as demais.
+    """
+    limites = limites or LIMITE_CONCORRENCIA_FONTES
+    semaforos = {
+        func.__name__: threading.BoundedSemaphore(limites.get(func.__name__, 1))
+        for func in FONTES
+    }
+
+    def tarefa(func, query):
+        with semaforos[func.__name__]:
+            return _buscar_na_fonte(func, query)
+
+    max_workers = sum(limites.get(func.__name__, 1) for func in FONTES)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = [
+            [executor.submit(tarefa, func, query) for func in FONTES]
+            for query in consultas
+        ]
+        for futuros_query in futuros:
+            artigos = []
+            for futuro in futuros_query:
+                artigos.extend(futuro.result())
+            yield artigos
+
+
+def buscar_todas_em_paralelo(consultas, limites=None):
+    """Como 'buscar_em_paralelo_em_fluxo', mas espera todas as queries e retorna a lista."""
+    return list(buscar_em_paralelo_em_fluxo(consultas, limites))
+
+
 # --- Função Principal ---
 
-def coletar_noticias_por_categoria(max_por_query=5, debug=False):
+def coletar_em_fluxo(max_por_query=5, debug=False, paralelo=True):
     """
-    Coleta notícias de todas as fontes, removendo duplicatas por link 
-    E por similaridade de título.
+    Gera as notícias de todas as fontes, já sem duplicatas por link E por
+    similaridade de título, query a query.
+
+    Com 'paralelo=True' todas as requisições são feitas de uma vez e a
+    deduplicação de cada query roda assim que ela (e as anteriores) termina,
+    na ordem original das queries, de forma que o resultado é o mesmo da
+    coleta sequencial e as primeiras notícias saem antes do fim da coleta.
     """
-    results = []
     seen_links = set()       # Conjunto para links já vistos
-    # Lista para títulos já vistos (para fuzzy matching)
-    titulos_vistos = []
+    # Índice de títulos já vistos (para fuzzy matching)
+    titulos_vistos = IndiceTitulos(limite=0.85)
+
+    consultas = [query for queries in QUERIES.values() for query in queries]
+    if paralelo:
+        print(f"\n⚡ Buscando {len(consultas)} queries em paralelo...")
+        coletadas = buscar_em_paralelo_em_fluxo(consultas)
 
     for categoria, queries in QUERIES.items():
         print(f"\n📡 Coletando categoria: {categoria}")
         for query in queries:
             print(f"   🔍 Buscando por: {query}")
-            noticias_query = []
 
             # Coleta das fontes
-            for func in [get_newsapi, get_gnews, get_google_news]:
-                try:
-                    fontes = func(query)
-                    noticias_query.extend(fontes)
-                except Exception as e:
-                    print(f"   ⚠️ Erro em {func.__name__} ({query}): {e}")
+            if paralelo:
+                noticias_query = next(coletadas)
+            else:
+                noticias_query = []
+                for func in FONTES:
+                    noticias_query.extend(_buscar_na_fonte(func, query))
 
             # 🔹 Remove duplicadas (Link exato + Título similar)
             noticias_unicas = []
 
             for art in noticias_query:
-                titulo_limpo = art.get('titulo', 'Sem título').strip()
-                link = art.get("link")
+                titulo_limpo = (art.titulo or 'Sem título').strip()
+                link = art.chave
 
                 # 1. Verifica Link Exato
                 if not link or link in seen_links:
+                    METRICAS.incrementar("dedup_descartadas", motivo="link")
                     continue
 
                 # 2. Verifica Similaridade de Título (evita repetição de mesmo assunto de sites diferentes)
                 # Se for mais de 85% similar a qualquer título já coletado (mesmo em outras queries), descarta.
                 if verificar_similaridade(titulo_limpo, titulos_vistos, limite=0.85):
+                    METRICAS.incrementar("dedup_descartadas", motivo="titulo")
                     if debug:
                         print(
                             f"      ↳ Duplicata ignorada por similaridade: {titulo_limpo}")
@@ -192,22 +276,31 @@ def coletar_noticias_por_categoria(max_por_query=5, debug=False):
                 noticias_unicas.append(art)
 
             # 🔹 Ordena por data e limita a quantidade por query
-            noticias_unicas.sort(key=lambda n: n.get("data", ""), reverse=True)
+            noticias_unicas.sort(key=lambda n: n.data or date.min, reverse=True)
             noticias_limite = noticias_unicas[:max_por_query]
+            METRICAS.incrementar("dedup_descartadas", len(noticias_unicas) - len(noticias_limite),
+                                 motivo="limite_query")
 
             print(
                 f"   → Mantendo {len(noticias_limite)} notícias únicas da query '{query}'")
 
             if debug:
                 for n in noticias_limite:
-                    print(f"      📰 {n.get('titulo', 'Sem título')}")
+                    print(f"      📰 {n.titulo}")
 
             # Adiciona categoria e metadados finais
             for art in noticias_limite:
-                art["categoria"] = categoria
-                art["regiao"] = "Mundo"  # Valor inicial
-                results.append(art)
+                art.categoria = categoria
+                art.regiao = "Mundo"  # Valor inicial
+                yield art
+
 
+def coletar_noticias_por_categoria(max_por_query=5, debug=False, paralelo=True):
+    """
+    Coleta notícias de todas as fontes, removendo duplicatas por link 
+    E por similaridade de título (ver 'coletar_em_fluxo').
+    """
+    results = list(coletar_em_fluxo(max_por_query, debug, paralelo))
     print(
         f"\n✅ Total final de notícias coletadas (todas categorias): {len(results)}")
     return results
@@ -1,44 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta  # Importamos as ferramentas de data
-from typing import List, Dict
-import locale
+from datetime import date, datetime
+from typing import List
+from noticia import Noticia
+from parsing import sopa
+from paginacao import coletar_paginado
 
 
-def get_epe() -> List[Dict]:
-    """
-    Faz uma requisição para a página de notícias do EPE, extrai título, link e data,
-    e filtra apenas as notícias publicadas nos últimos 7 dias.
-    """
-    url = "https://www.epe.gov.br/pt/imprensa/noticias/area"
-
-    try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Erro na requisição: {e}")
-        return []
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-    artigos = []
-
-    # 1. Definir o limite de tempo (Hoje - 7 dias)
-    # Primeiro, ajustamos a localização para garantir o tratamento correto do mês, se necessário
-    # Embora a data seja D/M/A, é uma boa prática em scraping.
-    try:
-        # Tenta definir para português brasileiro
-        locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
-    except locale.Error:
-        # Se não conseguir, tenta um padrão
-        try:
-            locale.setlocale(locale.LC_TIME, 'portuguese')
-        except locale.Error:
-            pass  # Continua mesmo sem o locale
+URL_EPE = "https://www.epe.gov.br/pt/imprensa/noticias/area"
 
-    hoje = datetime.now().date()
-    data_limite = hoje - timedelta(days=7)  # Calcula a data de 7 dias atrás
 
-    # 2. Iterar e Filtrar
+def extrair_pagina_epe(html: str) -> List[Noticia]:
+    """Extrai cada notícia da listagem da EPE."""
+    # Só os blocos da listagem viram árvore; menus e rodapé são ignorados
+    soup = sopa(html, "div", "item")
+    itens = []
+
     for item in soup.select("div.item"):
         # Extração do TÍTULO e LINK (sem alterações)
         tag_a = item.find('a')
@@ -49,7 +24,7 @@ def get_epe() -> List[Dict]:
         titulo = tag_a.get_text(strip=True)
         link = tag_a.get("href")
 
-        # 3. Extrair e Converter a DATA
+        # Extrair e Converter a DATA
         tag_data = item.find('span', class_='date')
 
         if not tag_data:
@@ -57,9 +32,8 @@ def get_epe() -> List[Dict]:
 
         data_str = tag_data.get_text(strip=True).split()[0]
 
-        # 4. Extrair RESUMO (se disponível)
+        # Extrair RESUMO (se disponível)
         tag_resumo = item.find('p', class_='small')
-        # print(tag_resumo)
         resumo_com_data = tag_resumo.get_text(strip=True) if tag_resumo else ""
         # O resumo vem com a data no início, então removemos a data do início
         resumo_com_tags = resumo_com_data.split("-", 1)[-1]
@@ -68,7 +42,6 @@ def get_epe() -> List[Dict]:
 
         # extração CATEGORIA (se disponível)
         tag_categoria = item.find_all('a', class_='tag-area')
-        # print(tag_categoria)
         categorias = []
         for categoria in tag_categoria:
             categorias.append(categoria.get_text(strip=True))
@@ -84,36 +57,43 @@ def get_epe() -> List[Dict]:
             print(f"Erro ao processar a data '{data_str}': {e}")
             continue
 
-        # 4. O FILTRO: Verifica se a data da notícia é maior ou igual à data limite
-        if data_noticia >= data_limite:
-            # Formatar o link para ser absoluto
-            if link and not link.startswith("http"):
-                link = "https://www.epe.gov.br" + link
-
-            # Adicionar ao array de artigos
-            artigos.append({
-                "fonte": "Empresa de Pesquisa Energética (EPE)",
-                "titulo": titulo,
-                "link": link,
-                "data": data_str,  # Mantemos a string original para o output
-                "resumo": resumo,  # O EPE não fornece resumo na listagem
-                "categoria": categoria if categoria else "Sem categoria"
-            })
-        else:
-            # Opcional: Para otimizar, se a página estiver em ordem cronológica reversa
-            # (mais nova primeiro), podemos parar de iterar assim que encontrarmos
-            # uma notícia mais antiga que o limite.
-            # print(f"Notícia {titulo} é muito antiga ({data_str}). Parando...")
-            pass  # Descomente a linha acima se quiser otimizar o loop.
-
-    return artigos
+        # Formatar o link para ser absoluto
+        if link and not link.startswith("http"):
+            link = "https://www.epe.gov.br" + link
+
+        itens.append(Noticia(
+            fonte="Empresa de Pesquisa Energética (EPE)",
+            fonte_id="epe",
+            titulo=titulo,
+            link=link,
+            data=data_noticia,
+            resumo=resumo,  # O EPE não fornece resumo na listagem
+            categoria=categoria if categoria else "Sem categoria"
+        ))
+
+    return itens
+
+
+def _url_pagina_epe(pagina, lidos):
+    # A listagem da EPE não tem paginação por parâmetro conhecida: só a primeira página
+    return URL_EPE if pagina == 0 else None
+
+
+def get_epe(desde: date = None, ate: date = None, incremental: bool = False) -> List[Noticia]:
+    """
+    Lê a listagem de notícias da EPE (da mais nova para a mais antiga) e
+    retorna as publicadas nos últimos 7 dias, ou entre 'desde' e 'ate'.
+    Com 'incremental', para nas notícias já coletadas na execução anterior.
+    """
+    return coletar_paginado("EPE", _url_pagina_epe, extrair_pagina_epe,
+                            desde=desde, ate=ate, incremental=incremental)
 
 
 # Exemplo de uso:
-noticias = get_epe()
+# noticias = get_epe()
 # for noticia in noticias:
 #     print(
-#         f"Título: {noticia['titulo']} \n Data: {noticia['data']} \n Link: {noticia['link']}")
+#         f"Título: {noticia.titulo} \n Data: {noticia.data_formatada} \n Link: {noticia.link}")
 #     print("-" * 80)
 # # print(noticias)
 # print(f"  → {len(noticias)} artigos encontrados no EPE.")
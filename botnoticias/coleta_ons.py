@@ -1,77 +1,43 @@
 from datetime import datetime, timedelta
-import locale
-from typing import List, Dict
-from bs4 import BeautifulSoup
+import json
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
 
-# --- FERRAMENTAS DO SELENIUM ---
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import http_client
+from parsing import sopa
+from noticia import MESES, Noticia
+from config import ONS_URL_DADOS, ONS_USAR_NAVEGADOR
 
+URL_ONS = "https://www.ons.org.br/paginas/imprensa/noticias"
+FONTE_ONS = "Operador Nacional do Sistema Elétrico (ONS)"
 
-def get_ons() -> List[Dict]:
-    """
-    Busca notícias no site do ONS usando Selenium para renderizar o JavaScript
-    e filtra os resultados dos últimos 7 dias.
-    """
-    url = "https://www.ons.org.br/paginas/imprensa/noticias"  # URL do ONS
-    artigos = []
-
-    # 1. Configurar e Iniciar o Selenium (Modo Headless)
-    print("Iniciando Selenium para renderizar o conteúdo...")
-    options = Options()
-    # Roda em segundo plano, sem abrir a janela do navegador
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("user-agent=Mozilla/5.0...")  # Boa prática
-
-    # Gerencia e instala o driver do Chrome automaticamente
-    service = ChromeService(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-
-    try:
-        driver.get(url)
-
-        # Esperar até que a primeira div de notícia real apareça
-        # (O "By.CLASS_NAME" deve ser o seletor mais externo que você está usando)
-        # Ajuste o tempo se a página demorar muito.
-        wait = WebDriverWait(driver, 15)
-        wait.until(EC.presence_of_element_located((By.CLASS_NAME, "noticia")))
-
-        # 2. Obter o HTML Renderizado
-        html_renderizado = driver.page_source
+# Campos possíveis de cada item da listagem em JSON, em ordem de preferência
+CAMPOS_JSON = {
+    "titulo": ("Title", "titulo"),
+    "link": ("FileRef", "Url", "link"),
+    "data": ("ArticleStartDate", "Created", "data"),
+    "resumo": ("Description", "Resumo", "resumo"),
+}
 
-    except Exception as e:
-        print(f"Erro ao carregar a página com Selenium: {e}")
-        driver.quit()
-        return []
-    finally:
-        # 3. Fechar o navegador (MUITO IMPORTANTE)
-        driver.quit()
 
-    print("Conteúdo renderizado obtido. Iniciando Beautiful Soup...")
-
-    # 4. Processar o HTML com BeautifulSoup
-    soup = BeautifulSoup(html_renderizado, "html.parser")
+def _noticia(titulo, link, data, resumo) -> Noticia:
+    return Noticia(fonte=FONTE_ONS, fonte_id="ons", titulo=titulo, link=link,
+                   data=data, resumo=resumo, categoria="-")
 
-    # 5. Definir o limite de tempo (igual ao código anterior)
-    try:
-        locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
-    except:
-        pass
 
-    hoje = datetime.now().date()
-    data_limite = hoje - timedelta(days=7)
+def extrair_noticias_html(html: str, hoje=None, dias=7) -> Optional[List[Noticia]]:
+    """
+    Lê os blocos 'div.noticia' da página do ONS (renderizada pelo navegador
+    ou entregue já pronta pelo servidor) e mantém os dos últimos 'dias' dias.
+    Retorna None se nenhum bloco tiver data reconhecível (template ainda não
+    renderizado, página de erro), como 'extrair_noticias_json'.
+    """
+    hoje = hoje or datetime.now().date()
+    data_limite = hoje - timedelta(days=dias)
+    artigos, reconhecidos = [], 0
 
-    # 6. Iterar e Filtrar (Ajustado para a nova estrutura do ONS)
+    soup = sopa(html, "div", "noticia")
     for item in soup.select("div.noticia"):
-
-        # 6.1. Extrair Data
         try:
             dia_str = item.find('div', class_='data').find(
                 'p').get_text(strip=True)
@@ -81,59 +47,148 @@ def get_ons() -> List[Dict]:
             # Pula se a estrutura estiver incompleta (pode ser o template remanescente)
             continue
 
-        # O ONS geralmente usa o nome do mês (ex: "SET")
-        # Precisamos de um dicionário para converter
-        mes_map = {
-            'JAN': 1, 'FEV': 2, 'MAR': 3, 'ABR': 4, 'MAI': 5, 'JUN': 6,
-            'JUL': 7, 'AGO': 8, 'SET': 9, 'OUT': 10, 'NOV': 11, 'DEZ': 12
-        }
-
-        # Tenta a conversão da data
+        # O ONS usa o nome do mês (ex: "SET"); a página não mostra o ano: assumimos o atual
         try:
-            mes_num = mes_map[mes_str.upper()]
-            # Assumimos o ano atual
-            ano_atual = hoje.year
+            data_noticia = datetime(hoje.year, MESES[mes_str.upper()], int(dia_str)).date()
+        except (KeyError, ValueError):
+            # Dados sujos ou template não processado
+            continue
+        reconhecidos += 1
 
-            # Cria a string de data no formato D/M/A
-            data_completa_str = f"{dia_str}/{mes_num}/{ano_atual}"
+        if data_noticia < data_limite:
+            continue
 
-            # Converte para objeto datetime
-            data_noticia = datetime.strptime(
-                data_completa_str, '%d/%m/%Y').date()
+        tag_info = item.find('div', class_='info')
+        tag_a = tag_info.find('a')
+        artigos.append(_noticia(
+            titulo=tag_a.get_text(strip=True),
+            link=urljoin(URL_ONS, tag_a.get("href", "")),
+            data=data_noticia,
+            resumo=tag_info.find('p').get_text(strip=True),
+        ))
+    return artigos if reconhecidos else None
+
+
+def _campo(item: Dict, nome: str) -> str:
+    for chave in CAMPOS_JSON[nome]:
+        valor = item.get(chave)
+        if valor:
+            return str(valor).strip()
+    return ""
+
+
+def _itens_json(dados) -> List[Dict]:
+    """Aceita a lista pura ou os envelopes do SharePoint ('value' / 'd.results')."""
+    if isinstance(dados, list):
+        return dados
+    if "value" in dados:
+        return dados["value"]
+    if "d" in dados:
+        return dados["d"].get("results", [])
+    return []
+
+
+def extrair_noticias_json(dados, hoje=None, dias=7) -> Optional[List[Noticia]]:
+    """
+    Converte a listagem em JSON do ONS para o mesmo formato de
+    'extrair_noticias_html'. Retorna None se nenhum item tiver título e data
+    reconhecíveis (formato mudou), para que o chamador possa usar o navegador.
+    """
+    hoje = hoje or datetime.now().date()
+    data_limite = hoje - timedelta(days=dias)
+    artigos, reconhecidos = [], 0
 
-            # Filtro de ano: Se o mês for maior que o atual, assume que é do ano passado
-            # (Ex: Estamos em Jan/2026, a notícia é de Dez/2025)
-            # Obs: Isso é um refinamento, pode ser complexo. Por simplicidade,
-            # vamos apenas usar o filtro de 7 dias.
+    for item in _itens_json(dados):
+        titulo = _campo(item, "titulo")
+        try:
+            # Ex: "2025-10-14T13:00:00Z"; só a parte da data interessa
+            data_noticia = datetime.strptime(_campo(item, "data")[:10], "%Y-%m-%d").date()
+        except ValueError:
+            continue
+        if not titulo:
+            continue
+        reconhecidos += 1
 
-        except (KeyError, ValueError, IndexError):
-            # Se a conversão falhar (dados sujos ou template não processado)
+        if data_noticia < data_limite:
             continue
+        artigos.append(_noticia(
+            titulo=titulo,
+            link=urljoin(URL_ONS, _campo(item, "link")),
+            data=data_noticia,
+            resumo=_campo(item, "resumo"),
+        ))
 
-        # 6.2. O FILTRO: Verifica se a data da notícia é maior ou igual à data limite
-        if data_noticia >= data_limite:
+    return artigos if reconhecidos else None
 
-            # 6.3. Extrair Título, Link e Resumo
-            tag_info = item.find('div', class_='info')
-            tag_a = tag_info.find('a')
 
-            titulo = tag_a.get_text(strip=True)
-            link_relativo = tag_a.get("href")
-            resumo = tag_info.find('p').get_text(strip=True)
+def get_ons_http(hoje=None) -> Optional[List[Noticia]]:
+    """
+    Busca a listagem de notícias direto no endpoint de dados do ONS, sem
+    navegador. Entende JSON e HTML com blocos 'div.noticia'. Retorna None se
+    a resposta não trouxer nenhuma notícia reconhecível.
+    """
+    resp = http_client.get(ONS_URL_DADOS, timeout=10,
+                           headers={"Accept": "application/json;odata=nometadata"})
+    resp.raise_for_status()
+
+    if "json" in resp.headers.get("Content-Type", ""):
+        return extrair_noticias_json(json.loads(resp.text), hoje)
+
+    html = resp.text
+    if "noticia" not in html:
+        return None
+    return extrair_noticias_html(html, hoje)
+
+
+def get_ons_selenium(hoje=None) -> List[Noticia]:
+    """Renderiza a página do ONS no Chrome e lê as notícias (caminho lento)."""
+    # Importados aqui para que o caminho HTTP não dependa do Selenium
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from navegador import get_pool
 
-            # Formata o link
-            link = f"{link_relativo}"
+    # Pegar um navegador do pool (já aberto após a primeira coleta)
+    print("Renderizando o conteúdo com Selenium...")
+    try:
+        with get_pool().emprestar() as driver:
+            driver.get(URL_ONS)
+
+            # Esperar até que a primeira div de notícia real apareça
+            wait = WebDriverWait(driver, 15)
+            wait.until(EC.presence_of_element_located((By.CLASS_NAME, "noticia")))
+
+            html_renderizado = driver.page_source
+
+    except Exception as e:
+        # O pool descarta o navegador que falhou
+        print(f"Erro ao carregar a página com Selenium: {e}")
+        return []
+
+    print("Conteúdo renderizado obtido. Iniciando Beautiful Soup...")
+    artigos = extrair_noticias_html(html_renderizado, hoje)
+    if artigos is None:
+        print("⚠️ Nenhuma notícia reconhecível na página do ONS (o layout mudou?)")
+        return []
+    return artigos
+
+
+def get_ons() -> List[Noticia]:
+    """
+    Busca as notícias dos últimos 7 dias no site do ONS. Tenta primeiro a
+    listagem por HTTP e só renderiza a página com Selenium se ela falhar.
+    """
+    try:
+        artigos = get_ons_http()
+    except Exception as e:
+        print(f"Erro ao buscar a listagem do ONS por HTTP: {e}")
+        artigos = None
 
-            # Adicionar ao array de artigos
-            artigos.append({
-                "fonte": "Operador Nacional do Sistema Elétrico (ONS)",
-                "titulo": titulo,
-                "link": link,
-                # Data formatada para output
-                "data": f"{dia_str}/{mes_str}/{ano_atual}",
-                "resumo": resumo,
-                "categoria": "-"
-            })
+    if artigos is None:
+        if not ONS_USAR_NAVEGADOR:
+            print("Listagem do ONS indisponível e navegador desativado.")
+            return []
+        artigos = get_ons_selenium()
 
     print(f"Filtro concluído. Encontrados {len(artigos)} artigos recentes.")
     return artigos
@@ -143,7 +198,7 @@ def get_ons() -> List[Dict]:
 # noticias_ons = get_ons()
 # for noticia in noticias_ons:
 #     print(
-#         f"Título: {noticia['titulo']} \n Data: {noticia['data']} \n Link: {noticia['link']}")
+#         f"Título: {noticia.titulo} \n Data: {noticia.data_formatada} \n Link: {noticia.link}")
 #     print("-" * 80)
 # # print(noticias_ons)
 # print(f"  → {len(noticias_ons)} artigos encontrados no MME.")
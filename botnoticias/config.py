@@ -10,9 +10,92 @@ GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 GNEWS_API_KEY = os.getenv("GNEWS_API_KEY")
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
+# Limites da cota do Gemini (requisições e tokens por minuto)
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "10"))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", "250000"))
+GEMINI_MAX_LOTES_SIMULTANEOS = int(os.getenv("GEMINI_MAX_LOTES_SIMULTANEOS", "4"))
+# Orçamento estimado (entrada + saída) de cada lote e limite de saída do modelo
+GEMINI_TOKENS_POR_LOTE = int(os.getenv("GEMINI_TOKENS_POR_LOTE", "6000"))
+GEMINI_MAX_TOKENS_SAIDA = int(os.getenv("GEMINI_MAX_TOKENS_SAIDA", "8192"))
+
 # Linguagem
 LANGUAGE = "pt"
 
+# ---------------------------------------------
+# 🏛️ Fontes oficiais (main_gov.py)
+# ---------------------------------------------
+# Tempo máximo (s) de cada scraper; o ONS usa navegador e demora mais
+TIMEOUT_PADRAO_FONTE = int(os.getenv("TIMEOUT_PADRAO_FONTE", "30"))
+TIMEOUT_FONTES_GOV = {
+    "ONS": int(os.getenv("TIMEOUT_ONS", "90")),
+}
+# Páginas máximas lidas por listagem (MME, ANEEL, EPE) numa mesma coleta
+PAGINAS_MAX_FONTE = int(os.getenv("PAGINAS_MAX_FONTE", "20"))
+# Listagem de notícias do ONS lida direto por HTTP (sem navegador). O Selenium
+# só é usado se esta URL falhar ou não trouxer nenhuma notícia reconhecível.
+ONS_URL_DADOS = os.getenv(
+    "ONS_URL_DADOS",
+    "https://www.ons.org.br/_api/web/lists/getbytitle('Noticias')/items"
+    "?$select=Title,FileRef,ArticleStartDate,Created,Description&$orderby=Created desc&$top=50")
+ONS_USAR_NAVEGADOR = os.getenv("ONS_USAR_NAVEGADOR", "1") == "1"
+# Navegadores mantidos abertos para os scrapers que precisam de JavaScript
+NAVEGADOR_POOL_TAMANHO = int(os.getenv("NAVEGADOR_POOL_TAMANHO", "1"))
+
+# ---------------------------------------------
+# 🗄️ Armazenamento local (notícias já vistas/classificadas)
+# ---------------------------------------------
+PASTA_DADOS = os.getenv("BOTNOTICIAS_DADOS", os.path.join(
+    os.path.abspath(os.path.dirname(__file__)), "dados"))
+CAMINHO_BANCO = os.path.join(PASTA_DADOS, "noticias.sqlite3")
+
+# Cache HTTP (ETag/Last-Modified) das páginas e APIs coletadas
+CAMINHO_CACHE_HTTP = os.path.join(PASTA_DADOS, "cache_http.sqlite3")
+# As URLs das APIs levam as datas da busca, então cada dia cria entradas novas:
+# descarta as não usadas há mais de CACHE_HTTP_TTL_DIAS e as mais antigas acima do máximo
+CACHE_HTTP_TTL_DIAS = int(os.getenv("CACHE_HTTP_TTL_DIAS", "7"))
+CACHE_HTTP_MAX_ITENS = int(os.getenv("CACHE_HTTP_MAX_ITENS", "2000"))
+HTTP_TIMEOUT = int(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_TENTATIVAS = int(os.getenv("HTTP_TENTATIVAS", "3"))
+
+# Cache das respostas do Gemini (por título+fonte)
+CAMINHO_CACHE_IA = os.path.join(PASTA_DADOS, "cache_ia.sqlite3")
+CACHE_IA_TTL_DIAS = int(os.getenv("CACHE_IA_TTL_DIAS", "30"))
+CACHE_IA_MAX_ITENS = int(os.getenv("CACHE_IA_MAX_ITENS", "20000"))
+
+# Checkpoints das etapas do main.py (uma pasta por dia, usada pelo --resume)
+PASTA_CHECKPOINTS = os.path.join(PASTA_DADOS, "checkpoints")
+# Quantas classificações novas acumular antes de regravar o checkpoint
+CHECKPOINT_INTERVALO_IA = int(os.getenv("CHECKPOINT_INTERVALO_IA", "20"))
+
+# Relatórios de métricas de cada execução (JSON) e, opcionalmente, o arquivo
+# .prom lido pelo textfile collector do Prometheus (vazio = desativado)
+PASTA_METRICAS = os.path.join(PASTA_DADOS, "metricas")
+METRICAS_PROMETHEUS = os.getenv("METRICAS_PROMETHEUS", "")
+
+# ---------------------------------------------
+# 📄 PDFs
+# ---------------------------------------------
+# Imagem de fundo (template.png): largura máxima em pixels e qualidade JPEG
+# para recomprimi-la antes de embutir nos PDFs (0 = mantém a original)
+TEMPLATE_LARGURA_MAX = int(os.getenv("TEMPLATE_LARGURA_MAX", "0"))
+TEMPLATE_QUALIDADE_JPEG = int(os.getenv("TEMPLATE_QUALIDADE_JPEG", "0"))
+# Processos que renderizam os PDFs em paralelo (0 = um por núcleo)
+RENDER_PROCESSOS = int(os.getenv("RENDER_PROCESSOS", "0"))
+# Relatórios maiores que isso são divididos em partes renderizadas em paralelo
+RENDER_NOTICIAS_POR_PARTE = int(os.getenv("RENDER_NOTICIAS_POR_PARTE", "150"))
+# Parágrafos já montados e medidos guardados por processo (0 = sem cache)
+RENDER_CACHE_PARAGRAFOS = int(os.getenv("RENDER_CACHE_PARAGRAFOS", "20000"))
+
+# ---------------------------------------------
+# ⚡ Concorrência da coleta
+# ---------------------------------------------
+# Quantas requisições simultâneas cada fonte aceita (evita bloqueio por excesso)
+LIMITE_CONCORRENCIA_FONTES = {
+    "get_newsapi": int(os.getenv("LIMITE_NEWSAPI", "4")),
+    "get_gnews": int(os.getenv("LIMITE_GNEWS", "2")),
+    "get_google_news": int(os.getenv("LIMITE_GOOGLE_NEWS", "4")),
+}
+
 # ---------------------------------------------
 # 🔍 Consultas por categoria
 # ---------------------------------------------
@@ -59,12 +142,14 @@ QUERIES = {
 ENERGIA_KEYWORDS = [
     "energia elétrica", "solar", "eólica", "hidrelétrica",
     "petróleo", "gás natural", "biomassa", "biogás", "combustível",
-    "renovável", "transmissão", "distribuição", "usina", "óleo diesel"
+    "renovável", "transmissão", "distribuição", "usina", "óleo diesel",
+    "termelétrica", "biodiesel", "hidrogênio verde", "leilão de energia"
 ]
 
 MINERACAO_KEYWORDS = [
     "mineração", "mineradora", "minério", "lavra", "jazida",
-    "ferro", "cobre", "níquel", "lítio", "ouro", "extração", "garimpo"
+    "ferro", "cobre", "níquel", "lítio", "ouro", "extração", "garimpo",
+    "bauxita", "fosfato", "nióbio", "urânio"
 ]
 
 # Palavras que indicam falso positivo (quando aparecem sozinhas)
@@ -77,6 +162,25 @@ STOPWORDS_FALSOS_POSITIVOS = [
 # ---------------------------------------------
 # 📅 Intervalo de datas (ontem até antes de ontem)
 # ---------------------------------------------
+def janela_datas(hoje=None):
+    """
+    (de, até) da busca nas APIs, calculado na hora: um processo de longa
+    duração (agendador.py) não pode ficar com as datas do dia em que subiu.
+    """
+    hoje = hoje or datetime.now().date()
+    return ((hoje - timedelta(days=2)).strftime("%Y-%m-%d"),  # antes de ontem
+            (hoje - timedelta(days=1)).strftime("%Y-%m-%d"))  # ontem
+
+
+# Valores do momento da importação (nos coletores use janela_datas())
 HOJE = datetime.now().date()
-FROM_DATE = (HOJE - timedelta(days=2)).strftime("%Y-%m-%d")  # antes de ontem
-TO_DATE = (HOJE - timedelta(days=1)).strftime("%Y-%m-%d")    # ontem
+FROM_DATE, TO_DATE = janela_datas(HOJE)
+
+# ---------------------------------------------
+# ⏰ Agendador (modo daemon, agendador.py)
+# ---------------------------------------------
+# Expressões cron (minuto hora dia mês dia-da-semana), no horário local
+AGENDA_MAIN = os.getenv("AGENDA_MAIN", "0 7 * * *")       # Relatório diário (main.py)
+AGENDA_GOV = os.getenv("AGENDA_GOV", "30 7 * * *")        # Fontes oficiais (main_gov.py)
+# Próxima e última execução de cada tarefa (lido por 'agendador.py --status')
+ARQUIVO_STATUS_AGENDADOR = os.path.join(PASTA_DADOS, "agendador.json")
@@ -0,0 +1,136 @@
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from itertools import chain
+import math
+
+# Tamanho dos n-gramas de caracteres usados no índice
+TAMANHO_NGRAMA = 3
+
+
+def _ngramas(texto, n=TAMANHO_NGRAMA):
+    """Conta os n-gramas de caracteres do texto (com repetição)."""
+    return Counter(texto[i:i + n] for i in range(len(texto) - n + 1))
+
+
+class IndiceTitulos:
+    """
+    Índice de títulos para detectar quase-duplicatas sem comparar com todos.
+
+    Mantém a mesma regra de 'verificar_similaridade' (SequenceMatcher.ratio()
+    >= limite, em minúsculas), mas só calcula o ratio para um pequeno conjunto
+    de candidatos:
+
+    1. Filtros exatos dizem quem pode atingir o limite:
+       - ratio = 2*M/T, onde M são os caracteres casados e T = len(a) + len(b),
+         então é preciso 2*min(len) / T >= limite;
+       - M se divide em k blocos contíguos, com k - 1 <= T - 2*M. Cada bloco
+         de tamanho L contém L - (n - 1) n-gramas presentes nos dois títulos,
+         então 'a' e 'b' compartilham pelo menos M - (n - 1) * k n-gramas.
+    2. Candidatos vêm de um índice invertido n-grama -> títulos. Se um
+       candidato precisa de pelo menos t n-gramas em comum com os q do
+       título, ele tem pelo menos t - (q - p) dos p n-gramas mais raros do
+       título (prefix filtering): só as listas desses n-gramas são lidas, e
+       quem não tem acertos suficientes nelas nem chega a ser comparado.
+    3. Só então roda o SequenceMatcher.
+
+    Títulos curtos demais para o filtro de n-gramas são comparados com todos
+    os títulos de tamanho compatível, como na varredura original. Nenhum
+    filtro descarta um par com ratio >= limite: o resultado é sempre o mesmo
+    da varredura linear.
+    """
+
+    def __init__(self, titulos=None, limite=0.85):
+        self.limite = limite
+        self._titulos = []                    # títulos em minúsculas
+        self._ngramas = []                    # conjunto de n-gramas de cada título
+        self._indice = defaultdict(list)      # n-grama -> ids dos títulos
+        self._por_tamanho = defaultdict(list)  # tamanho -> ids dos títulos
+        for titulo in titulos or []:
+            self.adicionar(titulo)
+
+    def __len__(self):
+        return len(self._titulos)
+
+    def __iter__(self):
+        return iter(self._titulos)
+
+    def adicionar(self, titulo):
+        """Registra um título no índice."""
+        titulo_low = titulo.lower()
+        idx = len(self._titulos)
+        ngramas = set(_ngramas(titulo_low))
+        self._titulos.append(titulo_low)
+        self._ngramas.append(ngramas)
+        for ngrama in ngramas:
+            self._indice[ngrama].append(idx)
+        self._por_tamanho[len(titulo_low)].append(idx)
+
+    def append(self, titulo):
+        """Alias de 'adicionar', para o índice substituir a lista de títulos."""
+        self.adicionar(titulo)
+
+    def _faixa_tamanhos(self, tamanho, limite):
+        """Tamanhos de título que ainda podem atingir o limite de similaridade."""
+        minimo = math.ceil(limite * tamanho / (2 - limite))
+        maximo = math.floor((2 - limite) * tamanho / limite)
+        return minimo, maximo
+
+    def _minimo_ngramas_comuns(self, tamanho_a, tamanho_b, limite):
+        """Limite inferior de n-gramas de 'a' presentes em 'b' quando ratio >= limite."""
+        total = tamanho_a + tamanho_b
+        casados = math.ceil(limite * total / 2)
+        blocos = max(total - 2 * casados + 1, 1)
+        return casados - (TAMANHO_NGRAMA - 1) * blocos
+
+    def _candidatos(self, titulo_low, ngramas, limite):
+        if limite <= 0:
+            return range(len(self._titulos))
+        minimo, maximo = self._faixa_tamanhos(len(titulo_low), limite)
+
+        # Trabalhamos com n-gramas distintos (interseção de sets, feita em C).
+        # Um n-grama repetido em 'a' pode valer várias ocorrências, por isso
+        # a exigência é descontada das repetições.
+        repeticoes = max(len(titulo_low) - TAMANHO_NGRAMA + 1, 0) - len(ngramas)
+        exigidos_por_tamanho = {
+            tamanho: self._minimo_ngramas_comuns(len(titulo_low), tamanho, limite) - repeticoes
+            for tamanho in range(minimo, maximo + 1)
+        }
+        resultado = []
+        exigidos = []
+        for tamanho, exigido in exigidos_por_tamanho.items():
+            if exigido <= 0:
+                # Curtos demais para o filtro de n-gramas: vale só o de tamanho
+                resultado.extend(self._por_tamanho.get(tamanho, ()))
+            elif exigido <= len(ngramas):
+                exigidos.append(exigido)
+        if not exigidos:
+            return resultado
+
+        # Todo candidato com t n-gramas em comum acerta pelo menos
+        # t - (q - p) dos p mais raros; p >= q - min(t) + 1 garante um acerto
+        indice = self._indice
+        q = len(ngramas)
+        p = q - min(exigidos) + 1
+        raros = sorted(ngramas, key=lambda ngrama: len(indice.get(ngrama, ())))[:p]
+        acertos = Counter(chain.from_iterable(indice.get(ngrama, ()) for ngrama in raros))
+
+        titulos = self._titulos
+        conjuntos = self._ngramas
+        for idx, quantidade in acertos.items():
+            exigido = exigidos_por_tamanho.get(len(titulos[idx]))
+            if (exigido is not None and 0 < exigido <= quantidade + q - p
+                    and len(ngramas & conjuntos[idx]) >= exigido):
+                resultado.append(idx)
+        return resultado
+
+    def contem_similar(self, titulo, limite=None):
+        """Retorna True se algum título do índice tiver ratio >= limite com 'titulo'."""
+        limite = self.limite if limite is None else limite
+        titulo_low = titulo.lower()
+        ngramas = set(_ngramas(titulo_low))
+
+        for idx in self._candidatos(titulo_low, ngramas, limite):
+            matcher = SequenceMatcher(None, titulo_low, self._titulos[idx])
+            if matcher.quick_ratio() >= limite and matcher.ratio() >= limite:
+                return True
+        return False
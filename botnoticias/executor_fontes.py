@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Callable, Dict, List, Tuple
+
+from config import TIMEOUT_PADRAO_FONTE
+from metricas import METRICAS
+from noticia import Noticia
+
+# Fontes cuja thread ainda está rodando (estourou o tempo numa coleta anterior)
+_em_andamento = {}
+_lock = threading.Lock()
+
+
+def _iniciar(nome, func) -> Future:
+    """Roda a fonte numa thread daemon e retorna um Future com o resultado."""
+    futuro = Future()
+
+    def rodar():
+        try:
+            futuro.set_result(func())
+        except BaseException as e:
+            futuro.set_exception(e)
+        finally:
+            with _lock:
+                _em_andamento.pop(nome, None)
+
+    thread = threading.Thread(target=rodar, name=f"fonte-{nome}", daemon=True)
+    with _lock:
+        _em_andamento[nome] = thread
+    thread.start()
+    return futuro
+
+
+def executar_fontes(fontes: Dict[str, Callable[[], List[Noticia]]],
+                    timeouts: Dict[str, float] = None) -> Tuple[Dict[str, List[Noticia]], Dict[str, str]]:
+    """
+    Executa todas as fontes ao mesmo tempo, cada uma com seu próprio timeout.
+
+    Args:
+        fontes: nome da fonte -> função sem argumentos que retorna a lista de notícias.
+        timeouts: nome da fonte -> segundos. Fontes sem valor usam TIMEOUT_PADRAO_FONTE.
+
+    Returns:
+        (resultados, erros): notícias por fonte (na ordem de 'fontes') e a
+        mensagem de erro de cada fonte que falhou ou estourou o tempo. Uma
+        falha nunca interrompe as demais fontes.
+
+    Não há como interromper um scraper no meio: o que estoura o tempo é
+    abandonado e a thread dele termina sozinha. Como as threads são daemon,
+    elas não seguram a saída do programa. Num processo de longa duração
+    (agendador.py), a fonte que ainda estiver rodando desde a coleta
+    anterior é pulada, em vez de abrir mais uma thread para ela.
+    """
+    timeouts = timeouts or {}
+    resultados, erros = {}, {}
+    inicio = time.monotonic()
+
+    futuros = {}
+    for nome, func in fontes.items():
+        with _lock:
+            ocupada = nome in _em_andamento
+        if ocupada:
+            erros[nome] = "ainda rodando desde a coleta anterior"
+            METRICAS.incrementar("coleta_erros", fonte=nome, motivo="em_andamento")
+            print(f"   ⚠️ {nome}: {erros[nome]}")
+            continue
+        futuros[nome] = _iniciar(nome, func)
+
+    for nome, futuro in futuros.items():
+        prazo = inicio + timeouts.get(nome, TIMEOUT_PADRAO_FONTE)
+        try:
+            resultados[nome] = futuro.result(timeout=max(prazo - time.monotonic(), 0)) or []
+            METRICAS.registrar_tempo("coleta_fonte", time.monotonic() - inicio, fonte=nome)
+            METRICAS.incrementar("coleta_itens", len(resultados[nome]), fonte=nome)
+            print(f"   ✔️ {nome}: {len(resultados[nome])} notícias "
+                  f"({time.monotonic() - inicio:.1f}s)")
+        except TimeoutError:
+            erros[nome] = f"tempo esgotado ({timeouts.get(nome, TIMEOUT_PADRAO_FONTE)}s)"
+            METRICAS.incrementar("coleta_erros", fonte=nome, motivo="timeout")
+            print(f"   ⚠️ {nome}: {erros[nome]}")
+        except Exception as e:
+            erros[nome] = f"{type(e).__name__}: {e}"
+            METRICAS.incrementar("coleta_erros", fonte=nome, motivo="erro")
+            print(f"   ⚠️ {nome}: {erros[nome]}")
+
+    # Resultados e erros na ordem de 'fontes'
+    return ({nome: resultados[nome] for nome in fontes if nome in resultados},
+            {nome: erros[nome] for nome in fontes if nome in erros})
@@ -0,0 +1,65 @@
+import importlib
+import importlib.util
+from typing import Callable, Dict, Iterable, List
+
+from noticia import Noticia
+
+
+class FonteGov:
+    """
+    Um coletor de fonte oficial registrado pelo nome. O módulo só é
+    importado quando a fonte é executada, então selecionar poucas fontes
+    (ou só importar este registro) não carrega BeautifulSoup, Selenium etc.
+    nem faz nenhuma requisição.
+    """
+
+    def __init__(self, nome: str, modulo: str, funcao: str, dependencias: Iterable[str] = (),
+                 paginada: bool = False):
+        self.nome = nome
+        self.modulo = modulo
+        self.funcao = funcao
+        self.dependencias = tuple(dependencias)
+        # Coletores paginados aceitam 'desde', 'ate' e 'incremental'
+        self.paginada = paginada
+
+    def dependencias_ausentes(self) -> List[str]:
+        """Pacotes necessários que não estão instalados (verifica sem importar)."""
+        return [dep for dep in self.dependencias if importlib.util.find_spec(dep) is None]
+
+    def carregar(self) -> Callable[[], List[Noticia]]:
+        ausentes = self.dependencias_ausentes()
+        if ausentes:
+            raise ImportError(f"dependências ausentes: {', '.join(ausentes)}")
+        return getattr(importlib.import_module(self.modulo), self.funcao)
+
+    def __call__(self, **opcoes) -> List[Noticia]:
+        return self.carregar()(**opcoes)
+
+
+# Fontes oficiais, na ordem em que aparecem no relatório. O Selenium do ONS
+# não entra nas dependências: é só o caminho de reserva, importado sob demanda.
+FONTES_GOV = {
+    fonte.nome: fonte for fonte in (
+        FonteGov("MME", "coleta_mme", "get_mme", ("requests", "bs4"), paginada=True),
+        FonteGov("ONS", "coleta_ons", "get_ons", ("requests", "bs4")),
+        FonteGov("ANEEL", "coleta_aneel", "get_aneel", ("requests", "bs4"), paginada=True),
+        FonteGov("EPE", "coleta_epe", "get_epe", ("requests", "bs4"), paginada=True),
+        FonteGov("Petrobras", "coleta_petrobras", "get_agencia_petrobras", ("requests", "bs4")),
+    )
+}
+
+
+def selecionar_fontes(nomes: Iterable[str] = None) -> Dict[str, FonteGov]:
+    """
+    Fontes pedidas pelo nome (sem diferenciar maiúsculas), na ordem do
+    registro. Sem nomes, retorna todas. Nomes desconhecidos geram ValueError.
+    """
+    if not nomes:
+        return dict(FONTES_GOV)
+    por_chave = {nome.lower(): nome for nome in FONTES_GOV}
+    pedidas = {nome.strip().lower() for nome in nomes if nome.strip()}
+    desconhecidas = pedidas - set(por_chave)
+    if desconhecidas:
+        raise ValueError(f"Fontes desconhecidas: {', '.join(sorted(desconhecidas))}. "
+                         f"Disponíveis: {', '.join(FONTES_GOV)}")
+    return {nome: fonte for nome, fonte in FONTES_GOV.items() if nome.lower() in pedidas}
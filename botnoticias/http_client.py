@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from config import (CAMINHO_CACHE_HTTP, CACHE_HTTP_MAX_ITENS, CACHE_HTTP_TTL_DIAS, HTTP_TIMEOUT,
+                    HTTP_TENTATIVAS)
+from metricas import METRICAS
+
+USER_AGENT = "Mozilla/5.0 (compatible; BotNoticias/1.0)"
+
+_sessao = None
+_lock_sessao = threading.Lock()
+
+
+def get_sessao():
+    """
+    Sessão HTTP compartilhada por todos os coletores: pool de conexões por
+    host (keep-alive) e novas tentativas com backoff para erros temporários.
+    """
+    global _sessao
+    with _lock_sessao:
+        if _sessao is None:
+            retry = Retry(
+                total=HTTP_TENTATIVAS,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"],
+                respect_retry_after_header=True,
+            )
+            adaptador = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+            sessao = requests.Session()
+            sessao.mount("http://", adaptador)
+            sessao.mount("https://", adaptador)
+            sessao.headers["User-Agent"] = USER_AGENT
+            _sessao = sessao
+        return _sessao
+
+
+class CacheHTTP:
+    """
+    Guarda o corpo e os validadores (ETag / Last-Modified) das respostas, para
+    que a próxima requisição da mesma URL seja condicional. Se o servidor
+    responder 304, o corpo salvo é reutilizado sem baixar a página de novo.
+
+    Entradas não usadas há mais de 'ttl_dias' expiram (cada 304 renova a
+    entrada) e, acima de 'max_itens', as mais antigas são descartadas.
+    """
+
+    def __init__(self, caminho=CAMINHO_CACHE_HTTP, ttl_dias=CACHE_HTTP_TTL_DIAS,
+                 max_itens=CACHE_HTTP_MAX_ITENS):
+        pasta = os.path.dirname(caminho)
+        if pasta and not os.path.exists(pasta):
+            os.makedirs(pasta)
+        self.ttl_segundos = ttl_dias * 24 * 3600
+        self.max_itens = max_itens
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS respostas (
+                chave TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                corpo BLOB NOT NULL,
+                salvo_em REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._remover_expirados()
+
+    def _remover_expirados(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM respostas WHERE salvo_em < ?",
+                               (time.time() - self.ttl_segundos,))
+            self._conn.commit()
+
+    def buscar(self, chave):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, etag, last_modified, headers, encoding, corpo FROM respostas"
+                " WHERE chave = ? AND salvo_em >= ?",
+                (chave, time.time() - self.ttl_segundos)).fetchone()
+
+    def renovar(self, chave):
+        """Marca a entrada como usada agora (o servidor confirmou que não mudou)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE respostas SET salvo_em = ? WHERE chave = ?", (time.time(), chave))
+            self._conn.commit()
+
+    def guardar(self, chave, url, resp):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return  # Sem validador não há como fazer GET condicional
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (chave, url, etag, last_modified, json.dumps(dict(resp.headers)),
+                 resp.encoding, resp.content, time.time()))
+            # Despeja as entradas mais antigas quando passar do tamanho máximo
+            self._conn.execute("""
+                DELETE FROM respostas WHERE chave IN (
+                    SELECT chave FROM respostas ORDER BY salvo_em DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_itens,))
+            self._conn.commit()
+
+
+_cache = None
+
+
+def _get_cache():
+    global _cache
+    with _lock_sessao:
+        if _cache is None:
+            _cache = CacheHTTP()
+        return _cache
+
+
+def _chave(url, params):
+    completa = url + ("?" + urlencode(sorted(params.items())) if params else "")
+    return hashlib.sha256(completa.encode("utf-8")).hexdigest()
+
+
+def _resposta_do_cache(salva):
+    url, _, _, headers, encoding, corpo = salva
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp.headers = CaseInsensitiveDict(json.loads(headers))
+    resp.encoding = encoding
+    resp._content = corpo
+    resp.from_cache = True
+    return resp
+
+
+def get(url, params=None, timeout=HTTP_TIMEOUT, condicional=True, **kwargs):
+    """
+    GET pela sessão compartilhada. Com 'condicional', envia If-None-Match /
+    If-Modified-Since quando já existe uma cópia da URL e devolve a cópia
+    (como uma resposta 200 com 'from_cache = True') se o servidor disser 304.
+    """
+    host = urlsplit(url).netloc
+    sessao = get_sessao()
+    if not condicional:
+        with METRICAS.cronometrar("http", host=host):
+            resp = sessao.get(url, params=params, timeout=timeout, **kwargs)
+        METRICAS.incrementar("http_bytes", len(resp.content), host=host)
+        return resp
+
+    cache = _get_cache()
+    chave = _chave(url, params)
+    salva = cache.buscar(chave)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if salva:
+        _, etag, last_modified, _, _, _ = salva
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    with METRICAS.cronometrar("http", host=host):
+        resp = sessao.get(url, params=params, timeout=timeout, headers=headers, **kwargs)
+    METRICAS.incrementar("http_bytes", len(resp.content), host=host)
+    if resp.status_code == 304 and salva:
+        METRICAS.incrementar("http_nao_modificado", host=host)
+        cache.renovar(chave)
+        return _resposta_do_cache(salva)
+
+    resp.from_cache = False
+    if resp.ok:
+        # Guarda a URL sem os parâmetros, que podem conter chaves de API
+        cache.guardar(chave, url, resp)
+    return resp
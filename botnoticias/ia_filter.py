@@ -1,60 +1,54 @@
-import time
+import asyncio
+from collections import deque
 import json
 from google import genai
-from google.genai import errors
-from config import GEMINI_API_KEY, GEMINI_MODEL
+from config import (GEMINI_API_KEY, GEMINI_MODEL, GEMINI_RPM, GEMINI_TPM,
+                    GEMINI_MAX_LOTES_SIMULTANEOS, GEMINI_TOKENS_POR_LOTE,
+                    GEMINI_MAX_TOKENS_SAIDA)
+from armazenamento import RESUMO_ERRO_IA
+from cache_ia import chave_cache
+from metricas import METRICAS
+from rate_limit import LimitadorTokens
 
 client = genai.Client(api_key=GEMINI_API_KEY)
 
-# 🚨 VARIÁVEIS DE CONTROLE DE RATE LIMIT 🚨
-RPM_LIMIT = 10
-DELAY_SECONDS = 60 / RPM_LIMIT
-LAST_REQUEST_TIME = 0.0
+# 🚨 CONTROLE DE RATE LIMIT 🚨
+# Token bucket compartilhado por todas as chamadas
+RPM_LIMIT = GEMINI_RPM
+LIMITADOR = LimitadorTokens(rpm=GEMINI_RPM, tpm=GEMINI_TPM)
 
+# Estimativa de tokens de saída por notícia (id, booleanos, enums e resumo curto)
+TOKENS_SAIDA_POR_NOTICIA = 60
 
-def wait_for_rate_limit():
-    """Calcula e espera o tempo necessário para respeitar o limite de 10 RPM."""
-    global LAST_REQUEST_TIME
-    current_time = time.time()
-    elapsed_time = current_time - LAST_REQUEST_TIME
-    wait_time = DELAY_SECONDS - elapsed_time
+# Versão do prompt/schema de classificação. Altere sempre que o prompt ou o
+# schema mudarem, para invalidar as respostas guardadas no cache.
+VERSAO_SCHEMA = 1
 
-    if wait_time > 0:
-        print(f"⏳ Esperando {wait_time:.2f}s (Rate Limit)...")
-        time.sleep(wait_time)
-
-    LAST_REQUEST_TIME = time.time()
-
-
-def processar_lote_noticias(lote_noticias, model_name=None, max_retries=3, debug=False):
-    """
-    Envia um lote de notícias para o Gemini e retorna uma lista de análises.
-    """
-    model = model_name or GEMINI_MODEL or "gemini-2.5-flash"
-
-    # Define o schema como um ARRAY de objetos
-    json_schema = {
-        "type": "array",
-        "items": {
-            "type": "object",
-            "properties": {
-                "id_original": {"type": "integer", "description": "O índice numérico fornecido na entrada para identificar a notícia."},
-                "relevante": {"type": "boolean", "description": "True se for relevante para o Piauí em energia/mineração."},
-                "resumo": {"type": "string", "description": "Resumo curto em 1 frase."},
-                "categoria": {"type": "string", "enum": ["Energia", "Mineração"], "description": "Categoria da notícia."},
-                "regiao": {"type": "string", "enum": ["Piauí", "Nordeste", "Brasil", "Mundo"], "description": "Região principal."}
-            },
-            "required": ["id_original", "relevante", "resumo", "categoria", "regiao"]
-        }
+# Define o schema como um ARRAY de objetos
+JSON_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "id_original": {"type": "integer", "description": "O índice numérico fornecido na entrada para identificar a notícia."},
+            "relevante": {"type": "boolean", "description": "True se for relevante para o Piauí em energia/mineração."},
+            "resumo": {"type": "string", "description": "Resumo curto em 1 frase."},
+            "categoria": {"type": "string", "enum": ["Energia", "Mineração"], "description": "Categoria da notícia."},
+            "regiao": {"type": "string", "enum": ["Piauí", "Nordeste", "Brasil", "Mundo"], "description": "Região principal."}
+        },
+        "required": ["id_original", "relevante", "resumo", "categoria", "regiao"]
     }
+}
 
-    # Monta o prompt com todas as notícias do lote
+
+def montar_prompt(lote_noticias):
+    """Monta o prompt com todas as notícias do lote."""
     texto_noticias = ""
     for i, n in enumerate(lote_noticias):
         # Usamos um índice (id_original) para garantir que a IA não perca a ordem
-        texto_noticias += f"ID {i}: Título: {n.get('titulo', '')} | Fonte: {n.get('fonte', '')}\n"
+        texto_noticias += f"ID {i}: Título: {n.titulo} | Fonte: {n.fonte}\n"
 
-    prompt = f"""
+    return f"""
     Você é analista do Governo do Piauí. Analise a lista de notícias abaixo.
     Para CADA notícia, determine se é RELEVANTE para o planejamento estadual em energia ou mineração.
     
@@ -64,82 +58,315 @@ def processar_lote_noticias(lote_noticias, model_name=None, max_retries=3, debug
     {texto_noticias}
     """
 
-    for attempt in range(max_retries):
-        try:
-            wait_for_rate_limit()
 
-            resp = client.models.generate_content(
+def estimar_tokens(prompt, quantidade_noticias):
+    """Estimativa grosseira (~4 caracteres por token) de entrada + saída."""
+    return len(prompt) // 4 + quantidade_noticias * TOKENS_SAIDA_POR_NOTICIA
+
+
+def _custo_noticia(noticia, posicao):
+    """Tokens estimados que uma notícia acrescenta ao lote (linha do prompt + saída)."""
+    linha = f"ID {posicao}: Título: {noticia.titulo} | Fonte: {noticia.fonte}\n"
+    return len(linha) // 4 + 1 + TOKENS_SAIDA_POR_NOTICIA
+
+
+def _limite_itens(max_tokens_saida, max_itens):
+    itens_por_saida = max(max_tokens_saida // TOKENS_SAIDA_POR_NOTICIA, 1)
+    return min(max_itens, itens_por_saida) if max_itens else itens_por_saida
+
+
+def montar_lotes_por_tokens(noticias, orcamento_tokens=GEMINI_TOKENS_POR_LOTE,
+                            max_tokens_saida=GEMINI_MAX_TOKENS_SAIDA, max_itens=None):
+    """
+    Agrupa as notícias (na ordem) em lotes cujo custo estimado de entrada +
+    saída cabe em 'orcamento_tokens', sem passar do limite de saída do modelo
+    (uma resposta truncada perde o JSON inteiro). 'max_itens' limita
+    opcionalmente a quantidade de notícias por lote.
+    """
+    fila = deque(noticias)
+    lotes = []
+    while fila:
+        lotes.append(_retirar_lote(fila, orcamento_tokens,
+                                   _limite_itens(max_tokens_saida, max_itens)))
+    return lotes
+
+
+def _retirar_lote(fila, orcamento_tokens, limite_itens):
+    """Tira do início da fila as notícias que cabem em um lote (pelo menos uma)."""
+    custo = estimar_tokens(montar_prompt([]), 0)
+    lote = []
+    while fila and len(lote) < limite_itens:
+        custo_noticia = _custo_noticia(_noticia_da_fila(fila[0]), len(lote))
+        if lote and custo + custo_noticia > orcamento_tokens:
+            break
+        lote.append(fila.popleft())
+        custo += custo_noticia
+    return lote
+
+
+def _noticia_da_fila(item):
+    # A fila de classificação guarda pares (notícia, tentativas)
+    return item[0] if isinstance(item, tuple) else item
+
+
+def _config_geracao():
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": JSON_SCHEMA
+    }
+
+
+def _interpretar_resposta(resp, tokens_estimados, debug):
+    """Registra o uso real de tokens e devolve a lista (ou None se inválida)."""
+    usage = resp.usage_metadata
+    LIMITADOR.registrar_uso(
+        usage.total_token_count if usage else None, tokens_estimados)
+    if usage:
+        METRICAS.incrementar("gemini_tokens_entrada", usage.prompt_token_count or 0)
+        METRICAS.incrementar("gemini_tokens_saida", usage.candidates_token_count or 0)
+    if debug and usage:
+        print(
+            f"   Tokens In: {usage.prompt_token_count} | Out: {usage.candidates_token_count} | Total: {usage.total_token_count}")
+
+    try:
+        lista_resultados = json.loads(resp.text)
+    except (TypeError, ValueError):
+        # JSON truncado (limite de saída) ou malformado
+        METRICAS.incrementar("gemini_respostas_invalidas")
+        if debug:
+            print("⚠️ IA retornou JSON inválido ou incompleto.")
+        return None
+
+    # Garante que retornamos uma lista, mesmo que a IA falhe em algo estrutural
+    if isinstance(lista_resultados, list):
+        return lista_resultados
+    if debug:
+        print("⚠️ IA não retornou uma lista. Tentando novamente.")
+    return None
+
+
+def _resultado_fallback(lote_noticias):
+    # Retorno de fallback (lista de erros vazios) caso falhe todas tentativas
+    return [{"relevante": False, "resumo": RESUMO_ERRO_IA, "categoria": "-", "regiao": "-", "id_original": i} for i in range(len(lote_noticias))]
+
+
+class ErroChamadaGemini(Exception):
+    """A chamada ao Gemini falhou (API, rede, cota); a resposta nem chegou."""
+
+
+async def _chamar_gemini_async(lote_noticias, model, debug):
+    """
+    Uma única chamada ao Gemini para o lote. Retorna a lista de análises, ou
+    None se a resposta veio inválida (truncada/malformada). Erros de API/rede
+    levantam ErroChamadaGemini: quem chama decide quando repetir.
+    """
+    prompt = montar_prompt(lote_noticias)
+    tokens_estimados = estimar_tokens(prompt, len(lote_noticias))
+
+    try:
+        await LIMITADOR.aguardar_async(tokens_estimados)
+
+        with METRICAS.cronometrar("gemini_chamada"):
+            resp = await client.aio.models.generate_content(
                 model=model,
                 contents=prompt,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_schema": json_schema
-                }
+                config=_config_geracao()
             )
+    except Exception as e:
+        METRICAS.incrementar("gemini_erros")
+        if debug:
+            print(f"⚠️ Erro IA Lote: {e}")
+        raise ErroChamadaGemini(str(e)) from e
+    return _interpretar_resposta(resp, tokens_estimados, debug)
 
-            usage = resp.usage_metadata
-            if debug:
-                print(
-                    f"   Tokens In: {usage.prompt_token_count} | Out: {usage.candidates_token_count} | Total: {usage.total_token_count}")
 
-            lista_resultados = json.loads(resp.text)
+def _resultado_valido(res, tamanho_lote):
+    """Confere se um item da resposta segue o schema e aponta para um ID do lote."""
+    if not isinstance(res, dict):
+        return False
+    propriedades = JSON_SCHEMA["items"]["properties"]
+    id_original = res.get("id_original")
+    return (
+        isinstance(id_original, int) and not isinstance(id_original, bool)
+        and 0 <= id_original < tamanho_lote
+        and isinstance(res.get("relevante"), bool)
+        and isinstance(res.get("resumo"), str)
+        and res.get("categoria") in propriedades["categoria"]["enum"]
+        and res.get("regiao") in propriedades["regiao"]["enum"]
+    )
 
-            # Garante que retornamos uma lista, mesmo que a IA falhe em algo estrutural
-            if isinstance(lista_resultados, list):
-                return lista_resultados
-            else:
-                if debug:
-                    print("⚠️ IA não retornou uma lista. Tentando novamente.")
 
-        except Exception as e:
-            if debug:
-                print(f"⚠️ Erro IA Lote (tentativa {attempt+1}): {e}")
-            time.sleep(2 ** attempt)
+def reconciliar_resposta(lista_resultados, tamanho_lote):
+    """
+    Separa a resposta do modelo em {id: análise} válidos. IDs que não
+    aparecem (ou vieram inválidos) ficam de fora e devem ser reenviados.
+    """
+    validos = {}
+    for res in lista_resultados or []:
+        if _resultado_valido(res, tamanho_lote):
+            validos.setdefault(res["id_original"], res)
+    return validos
 
-    # Retorno de fallback (lista de erros vazios) caso falhe todas tentativas
-    return [{"relevante": False, "resumo": "Erro na análise", "categoria": "-", "regiao": "-", "id_original": i} for i in range(len(lote_noticias))]
 
+def _lote_cheio(fila, orcamento_tokens, limite_itens):
+    """True se a fila já tem notícias suficientes para fechar um lote completo."""
+    if len(fila) >= limite_itens:
+        return True
+    custo = estimar_tokens(montar_prompt([]), 0)
+    for posicao, item in enumerate(fila):
+        custo += _custo_noticia(_noticia_da_fila(item), posicao)
+        if custo > orcamento_tokens:
+            return True
+    return False
 
-def filtrar_todas_noticias(noticias, batch_size=15, debug=True):
+
+async def classificar_em_fluxo(noticias, model_name=None, max_simultaneos=GEMINI_MAX_LOTES_SIMULTANEOS,
+                               orcamento_tokens=GEMINI_TOKENS_POR_LOTE, max_itens=None,
+                               max_retries=3, debug=False):
     """
-    Função principal que orquestra a divisão em lotes e atualização das notícias.
+    Classifica as notícias com até 'max_simultaneos' lotes em andamento e
+    entrega cada resultado assim que o lote dele volta (async generator de
+    pares (notícia, análise)).
+
+    'noticias' pode ser uma lista ou um iterável assíncrono que ainda está
+    sendo produzido (ex.: a coleta em andamento). Nesse caso um lote só é
+    enviado quando enche, ou quando a entrada termina.
+
+    A resposta de cada lote passa por uma reconciliação: os itens válidos são
+    aceitos na hora e os IDs ausentes ou inválidos voltam para a fila,
+    entrando no próximo lote montado. Uma notícia que passar por
+    'max_retries' chamadas sem análise válida sai com a análise de fallback
+    (RESUMO_ERRO_IA).
+
+    O tamanho dos lotes se ajusta sozinho: se a resposta vier inválida por
+    inteiro (ex.: JSON truncado), o orçamento dos lotes seguintes cai pela
+    metade, e cada lote respondido devolve um quarto do orçamento original,
+    até o limite. Um erro de API/rede não muda o orçamento: o lote volta
+    para a fila do mesmo tamanho e todos os trabalhadores esperam uma pausa
+    que dobra a cada erro seguido.
     """
-    print(
-        f"🤖 Iniciando filtro IA em lotes. Total: {len(noticias)} | Tamanho do lote: {batch_size}")
+    model = model_name or GEMINI_MODEL or "gemini-2.5-flash"
+    fila = deque()
+    saida = asyncio.Queue()
+    fila_alterada = asyncio.Event()
+    estado = {"restantes": 0, "entrada_aberta": True, "orcamento": orcamento_tokens,
+              "erros_seguidos": 0, "pausa_ate": 0.0}
+    loop = asyncio.get_running_loop()
+    limite_itens = _limite_itens(GEMINI_MAX_TOKENS_SAIDA, max_itens)
 
-    count_relevante = 0
+    def receber(noticia):
+        fila.append((noticia, 0))
+        estado["restantes"] += 1
+        fila_alterada.set()
 
-    # Processa em chunks (fatias) de tamanho batch_size
-    for i in range(0, len(noticias), batch_size):
-        lote = noticias[i: i + batch_size]
-        if debug:
-            print(f"   Processando lote {i} a {i+len(lote)}...")
+    async def alimentar():
+        if hasattr(noticias, "__aiter__"):
+            async for noticia in noticias:
+                receber(noticia)
+        else:
+            for noticia in noticias:
+                receber(noticia)
+        estado["entrada_aberta"] = False
+        fila_alterada.set()
 
-        resultados_lote = processar_lote_noticias(lote, debug=debug)
+    async def finalizar(noticia, dados_ia):
+        estado["restantes"] -= 1
+        await saida.put((noticia, dados_ia))
 
-        # Mapeia os resultados de volta para as notícias originais
-        # Cria um dicionário temporário para acesso rápido por ID
-        mapa_resultados = {res.get('id_original')                           : res for res in resultados_lote}
+    async def trabalhador():
+        while estado["entrada_aberta"] or estado["restantes"] > 0:
+            if not fila or (estado["entrada_aberta"]
+                            and not _lote_cheio(fila, estado["orcamento"], limite_itens)):
+                # Espera chegar mais notícias ou outro lote devolver itens para a fila
+                fila_alterada.clear()
+                await fila_alterada.wait()
+                continue
 
-        for idx_local, noticia in enumerate(lote):
-            dados_ia = mapa_resultados.get(idx_local)
+            itens = _retirar_lote(fila, estado["orcamento"], limite_itens)
+            lote = [noticia for noticia, _ in itens]
+            if debug:
+                print(f"   Processando lote de {len(lote)} notícias ({len(fila)} na fila)...")
 
-            if dados_ia:
-                noticia['relevante'] = dados_ia.get('relevante', False)
-                noticia['resumo'] = dados_ia.get('resumo', '')
-                noticia['categoria'] = dados_ia.get(
-                    'categoria', noticia.get('categoria'))
-                noticia['regiao'] = dados_ia.get('regiao', 'Mundo')
+            pausa = estado["pausa_ate"] - loop.time()
+            if pausa > 0:
+                await asyncio.sleep(pausa)
+            try:
+                lista_resultados = await _chamar_gemini_async(lote, model, debug)
+            except ErroChamadaGemini:
+                # Cota estourada ou queda: o tamanho do lote não tem culpa
+                lista_resultados = None
+                estado["erros_seguidos"] += 1
+                estado["pausa_ate"] = loop.time() + 2 ** min(estado["erros_seguidos"] - 1, 5)
             else:
-                # Caso raro onde a IA pula um ID
-                noticia['relevante'] = False
-
-            if noticia['relevante']:
-                count_relevante += 1
-                if debug:
-                    print(
-                        f"     ✔️ {noticia['titulo'][:30]}... ({noticia['regiao']})")
-
-    print(
-        f"✅ Análise concluída. {count_relevante} notícias relevantes identificadas.")
-    return noticias
+                estado["erros_seguidos"] = 0
+                if lista_resultados is None:
+                    if len(lote) > 1:
+                        estado["orcamento"] = max(estado["orcamento"] // 2, 1)
+                else:
+                    estado["orcamento"] = min(estado["orcamento"] + orcamento_tokens // 4,
+                                              orcamento_tokens)
+            validos = reconciliar_resposta(lista_resultados, len(lote))
+
+            reenviados = 0
+            for idx_local, (noticia, tentativas) in enumerate(itens):
+                if idx_local in validos:
+                    await finalizar(noticia, validos[idx_local])
+                elif tentativas + 1 < max_retries:
+                    fila.append((noticia, tentativas + 1))
+                    reenviados += 1
+                else:
+                    await finalizar(noticia, _resultado_fallback([noticia])[0])
+            if debug and reenviados:
+                print(f"   ↳ {reenviados} notícia(s) sem análise válida voltaram para a fila.")
+            fila_alterada.set()
+
+    async def coordenar():
+        # Os lotes começam a sair enquanto a entrada ainda está chegando
+        trabalhadores = [asyncio.ensure_future(trabalhador())
+                         for _ in range(max(max_simultaneos, 1))]
+        try:
+            await alimentar()
+            await asyncio.gather(*trabalhadores)
+        finally:
+            for tarefa in trabalhadores:
+                tarefa.cancel()
+            await saida.put(None)  # Tudo classificado (ou a entrada falhou)
+
+    coordenador = asyncio.ensure_future(coordenar())
+    try:
+        while True:
+            resultado = await saida.get()
+            if resultado is None:
+                break
+            yield resultado
+        await coordenador  # Propaga erros da entrada, se houver
+    finally:
+        coordenador.cancel()
+
+
+def _aplicar_resultado(noticia, dados_ia):
+    """Copia a análise da IA para a notícia."""
+    noticia.relevante = dados_ia.get('relevante', False)
+    noticia.resumo = dados_ia.get('resumo', '')
+    noticia.categoria = dados_ia.get('categoria', noticia.categoria)
+    noticia.regiao = dados_ia.get('regiao', 'Mundo')
+
+
+def aplicar_do_cache(cache, modelo, noticia):
+    """Preenche a notícia com a análise guardada no cache; True se havia uma."""
+    dados_cache = cache.obter(chave_cache(modelo, VERSAO_SCHEMA, noticia.titulo, noticia.fonte))
+    if not dados_cache:
+        return False
+    _aplicar_resultado(noticia, dados_cache)
+    return True
+
+
+def registrar_resultado(cache, modelo, noticia, dados_ia):
+    """Aplica a análise da IA na notícia e a guarda no cache (se não for o fallback de erro)."""
+    _aplicar_resultado(noticia, dados_ia)
+    if cache and dados_ia.get('resumo') != RESUMO_ERRO_IA:
+        cache.guardar(
+            chave_cache(modelo, VERSAO_SCHEMA, noticia.titulo, noticia.fonte),
+            {campo: dados_ia[campo] for campo in
+             ('relevante', 'resumo', 'categoria', 'regiao') if campo in dados_ia})
+
@@ -1,33 +1,49 @@
+import argparse
 from datetime import datetime
-from coleta_aneel import get_aneel
-from coleta_epe import get_epe
-from coleta_mme import get_mme
-from coleta_ons import get_ons
-from coleta_petrobras import get_agencia_petrobras
-from pdf_generator_gov import gerar_pdf
+from functools import partial
+from executor_fontes import executar_fontes
+from fontes_gov import FONTES_GOV, selecionar_fontes
+from config import TIMEOUT_FONTES_GOV
+from metricas import METRICAS
 
 
-def gerar_relatorio():
+def gerar_relatorio(fontes=None, desde=None, ate=None, incremental=False):
     """
-    Função principal que executa todos os scrapers, combina os resultados
+    Função principal que executa os scrapers, combina os resultados
     e gera o relatório PDF.
+
+    Args:
+        fontes: nomes das fontes a coletar (ex: ["aneel", "epe"]); None coleta todas.
+        desde, ate: intervalo de datas (backfill) para as fontes paginadas.
+        incremental: nas fontes paginadas, traz só o que é novo desde a última execução.
     """
+    # O gerador de PDF (reportlab) só é carregado quando o relatório vai ser gerado
+    from pdf_generator_gov import gerar_pdf
+
+    opcoes = {"desde": desde, "ate": ate, "incremental": incremental}
+    selecionadas = {
+        nome: partial(fonte, **opcoes) if fonte.paginada else fonte
+        for nome, fonte in selecionar_fontes(fontes).items()
+    }
     todas_noticias = []
 
     # 1. Coletar dados de todas as fontes
     print("=========================================")
     print("Iniciando coleta de dados de fontes oficiais...")
 
-    # Chame as funções de scraping e combine os resultados
-    todas_noticias.extend(get_mme())
-    todas_noticias.extend(get_ons())
-    todas_noticias.extend(get_aneel())
-    todas_noticias.extend(get_epe())
-    todas_noticias.extend(get_agencia_petrobras())
+    # Todos os scrapers rodam ao mesmo tempo; uma fonte com erro ou lenta
+    # demais não impede o relatório das demais
+    # Cada coletor só é importado dentro da própria thread, quando roda
+    resultados, erros = executar_fontes(selecionadas, TIMEOUT_FONTES_GOV)
+    for noticias_fonte in resultados.values():
+        todas_noticias.extend(noticias_fonte)
+    METRICAS.incrementar("noticias_coletadas", len(todas_noticias))
 
     print("=========================================")
     print(
         f"Coleta concluída. Total de {len(todas_noticias)} notícias encontradas.")
+    if erros:
+        print(f"Fontes com erro: {', '.join(f'{nome} ({erro})' for nome, erro in erros.items())}")
 
     # 2. Gerar PDF
     nome_arquivo = f"Relatorio_Governo_{datetime.now().strftime('%d%m%Y')}.pdf"
@@ -37,5 +53,32 @@ def gerar_relatorio():
     print(f"Processo finalizado. PDF salvo como: {nome_arquivo}")
 
 
-# Executa a função principal quando o script é chamado
-gerar_relatorio()
+def _data(texto):
+    try:
+        return datetime.strptime(texto, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {texto!r} (use AAAA-MM-DD)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Relatório de notícias das fontes oficiais.")
+    parser.add_argument(
+        "--sources", "--fontes", dest="fontes",
+        help=f"fontes separadas por vírgula (disponíveis: {', '.join(FONTES_GOV)})")
+    parser.add_argument("--desde", type=_data, help="backfill a partir desta data (AAAA-MM-DD)")
+    parser.add_argument("--ate", type=_data, help="backfill até esta data (AAAA-MM-DD)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="só notícias novas desde a última execução (MME, ANEEL, EPE)")
+    args = parser.parse_args()
+    if args.desde and args.ate and args.desde > args.ate:
+        parser.error("--desde não pode ser posterior a --ate")
+
+    try:
+        fontes = args.fontes.split(",") if args.fontes else None
+        selecionar_fontes(fontes)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        gerar_relatorio(fontes, desde=args.desde, ate=args.ate, incremental=args.incremental)
+    finally:
+        METRICAS.salvar("main_gov")
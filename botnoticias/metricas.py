@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from checkpoint import escrever_atomico
+from config import METRICAS_PROMETHEUS, PASTA_METRICAS
+
+
+def _rotulos_texto(rotulos):
+    return ",".join(f"{chave}={valor}" for chave, valor in rotulos)
+
+
+def _escapar_rotulo(valor):
+    """Escapa um valor de rótulo no formato texto do Prometheus (\\, quebra de linha e aspas)."""
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metricas:
+    """
+    Contadores e tempos de uma execução, com rótulos opcionais
+    (ex: fonte="get_newsapi"). Seguro para várias threads.
+
+    - incrementar: soma a um contador (itens, bytes, tokens, descartes);
+    - registrar_tempo / cronometrar: acumula segundos, chamadas e o máximo;
+    - definir: grava um valor pontual (ex: espera total do rate limit).
+
+    No fim, 'salvar' grava o relatório da execução em JSON (e, se
+    configurado, no formato texto do Prometheus).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._lock:
+            self.inicio = datetime.now()
+            self._relogio = time.perf_counter()
+            self._contadores = {}
+            self._tempos = {}
+            self._valores = {}
+
+    def incrementar(self, nome, valor=1, **rotulos):
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def definir(self, nome, valor, **rotulos):
+        with self._lock:
+            self._valores[(nome, tuple(sorted(rotulos.items())))] = valor
+
+    def registrar_tempo(self, nome, segundos, **rotulos):
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._lock:
+            total, chamadas, maximo = self._tempos.get(chave, (0.0, 0, 0.0))
+            self._tempos[chave] = (total + segundos, chamadas + 1, max(maximo, segundos))
+
+    @contextmanager
+    def cronometrar(self, nome, **rotulos):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_tempo(nome, time.perf_counter() - inicio, **rotulos)
+
+    @staticmethod
+    def _agrupar(entradas, converter=lambda valor: valor):
+        """{(nome, rótulos): valor} -> {nome: valor} ou {nome: {"k=v": valor}}."""
+        grupos = {}
+        for (nome, rotulos), valor in sorted(entradas.items()):
+            if rotulos:
+                grupos.setdefault(nome, {})[_rotulos_texto(rotulos)] = converter(valor)
+            else:
+                grupos[nome] = converter(valor)
+        return grupos
+
+    def relatorio(self, execucao=""):
+        """Relatório da execução como dicionário (pronto para json.dumps)."""
+        with self._lock:
+            contadores, tempos, valores = (dict(self._contadores), dict(self._tempos),
+                                           dict(self._valores))
+            duracao = time.perf_counter() - self._relogio
+        return {
+            "execucao": execucao,
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "duracao_segundos": round(duracao, 3),
+            "contadores": self._agrupar(contadores),
+            "tempos": self._agrupar(tempos, lambda t: {
+                "total_segundos": round(t[0], 3), "chamadas": t[1],
+                "max_segundos": round(t[2], 3)}),
+            "valores": self._agrupar(valores),
+        }
+
+    def para_prometheus(self, prefixo="botnoticias"):
+        """As mesmas métricas no formato texto do Prometheus (textfile collector)."""
+        def serie(nome, rotulos, valor):
+            texto = ",".join(f'{chave}="{_escapar_rotulo(v)}"' for chave, v in rotulos)
+            return f"{prefixo}_{nome}{{{texto}}} {valor}" if texto else f"{prefixo}_{nome} {valor}"
+
+        with self._lock:
+            contadores, tempos, valores = (dict(self._contadores), dict(self._tempos),
+                                           dict(self._valores))
+        linhas, tipos = [], set()
+        for (nome, rotulos), valor in sorted(contadores.items()):
+            if nome not in tipos:
+                linhas.append(f"# TYPE {prefixo}_{nome} counter")
+                tipos.add(nome)
+            linhas.append(serie(nome, rotulos, valor))
+        for (nome, rotulos), (total, chamadas, _) in sorted(tempos.items()):
+            if nome not in tipos:
+                linhas.append(f"# TYPE {prefixo}_{nome}_segundos summary")
+                tipos.add(nome)
+            linhas.append(serie(f"{nome}_segundos_sum", rotulos, round(total, 6)))
+            linhas.append(serie(f"{nome}_segundos_count", rotulos, chamadas))
+        for (nome, rotulos), valor in sorted(valores.items()):
+            if nome not in tipos:
+                linhas.append(f"# TYPE {prefixo}_{nome} gauge")
+                tipos.add(nome)
+            linhas.append(serie(nome, rotulos, valor))
+        return "\n".join(linhas) + "\n"
+
+    def resumo(self, limite=8):
+        """As medições que mais tomaram tempo, para imprimir no fim da execução."""
+        with self._lock:
+            tempos = sorted(self._tempos.items(), key=lambda item: item[1][0], reverse=True)
+        linhas = ["📊 Onde foi o tempo:"]
+        for (nome, rotulos), (total, chamadas, _) in tempos[:limite]:
+            rotulo = f" [{_rotulos_texto(rotulos)}]" if rotulos else ""
+            linhas.append(f"   {nome}{rotulo}: {total:.2f}s em {chamadas} chamada(s)")
+        return "\n".join(linhas)
+
+    def salvar(self, execucao, pasta=PASTA_METRICAS, prometheus=METRICAS_PROMETHEUS):
+        """
+        Grava o relatório JSON em 'pasta' (um arquivo por execução) e, se
+        'prometheus' for um caminho, as métricas no formato do Prometheus.
+        Retorna o caminho do JSON.
+        """
+        caminho = os.path.join(pasta, f"{execucao}_{self.inicio.strftime('%Y%m%d_%H%M%S')}.json")
+        escrever_atomico(caminho, json.dumps(self.relatorio(execucao), ensure_ascii=False, indent=2))
+        if prometheus:
+            escrever_atomico(prometheus, self.para_prometheus())
+        print(self.resumo())
+        print(f"📊 Relatório da execução salvo em {caminho}")
+        return caminho
+
+
+# Métricas da execução atual, compartilhadas por todos os módulos
+METRICAS = Metricas()
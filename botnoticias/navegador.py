@@ -0,0 +1,138 @@
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+from config import NAVEGADOR_POOL_TAMANHO
+
+# Recursos que não ajudam a extrair o texto da página e só atrasam o carregamento
+URLS_BLOQUEADAS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*clarity.ms*",
+]
+
+_caminho_driver = None
+_lock_driver = threading.Lock()
+
+
+def caminho_chromedriver():
+    """
+    Caminho do chromedriver, resolvido uma única vez por processo. Usa a
+    variável CHROMEDRIVER_PATH se existir; senão o webdriver_manager, que
+    mantém o binário em cache no disco.
+    """
+    global _caminho_driver
+    with _lock_driver:
+        if _caminho_driver is None:
+            _caminho_driver = os.getenv("CHROMEDRIVER_PATH")
+            if not _caminho_driver:
+                from webdriver_manager.chrome import ChromeDriverManager
+                _caminho_driver = ChromeDriverManager().install()
+        return _caminho_driver
+
+
+def criar_driver():
+    """Inicia um Chrome headless ajustado para scraping (sem imagens, fontes e analytics)."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    # Roda em segundo plano, sem abrir a janela do navegador
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("user-agent=Mozilla/5.0...")  # Boa prática
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+    })
+    # Não espera imagens/folhas de estilo: o scraper aguarda o elemento que precisa
+    options.page_load_strategy = "eager"
+
+    service = ChromeService(caminho_chromedriver())
+    driver = webdriver.Chrome(service=service, options=options)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": URLS_BLOQUEADAS})
+    except Exception as e:
+        print(f"Aviso: não foi possível bloquear recursos no navegador: {e}")
+    return driver
+
+
+class PoolNavegadores:
+    """
+    Mantém navegadores abertos entre as coletas. Os scrapers pegam um
+    emprestado com 'emprestar()' e o devolvem ao sair do bloco; só o primeiro
+    uso paga a inicialização do Chrome.
+    """
+
+    def __init__(self, tamanho=NAVEGADOR_POOL_TAMANHO):
+        self.tamanho = tamanho
+        self._livres = queue.Queue()
+        self._criados = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def emprestar(self, timeout=None):
+        driver = self._obter(timeout)
+        try:
+            yield driver
+        except Exception:
+            # O navegador pode ter ficado em estado ruim: descarta e cria outro depois
+            self._descartar(driver)
+            raise
+        else:
+            self._livres.put(driver)
+
+    def _obter(self, timeout):
+        try:
+            return self._livres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            pode_criar = self._criados < self.tamanho
+            if pode_criar:
+                self._criados += 1
+        if pode_criar:
+            try:
+                return criar_driver()
+            except Exception:
+                with self._lock:
+                    self._criados -= 1
+                raise
+        return self._livres.get(timeout=timeout)
+
+    def _descartar(self, driver):
+        with self._lock:
+            self._criados -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def encerrar(self):
+        """Fecha todos os navegadores livres."""
+        while True:
+            try:
+                driver = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(driver)
+
+
+_pool = None
+
+
+def get_pool():
+    """Pool de navegadores compartilhado pelo processo (fechado na saída)."""
+    global _pool
+    with _lock_driver:
+        if _pool is None:
+            _pool = PoolNavegadores()
+            atexit.register(_pool.encerrar)
+        return _pool
@@ -0,0 +1,138 @@
+import json
+import re
+from datetime import date, datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Parâmetros de rastreamento que não mudam a notícia apontada pelo link
+PARAMETROS_RASTREAMENTO = ("utm_", "fbclid", "gclid", "ocid", "cmpid")
+
+# Meses abreviados usados pelo ONS (ex: "16/OUT/2025")
+MESES = {
+    'JAN': 1, 'FEV': 2, 'MAR': 3, 'ABR': 4, 'MAI': 5, 'JUN': 6,
+    'JUL': 7, 'AGO': 8, 'SET': 9, 'OUT': 10, 'NOV': 11, 'DEZ': 12
+}
+
+_DATA_ISO = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+_DATA_BR = re.compile(r"^(\d{1,2})/(\d{1,2}|[A-Za-zç]{3})/(\d{4})")
+
+
+def normalizar_link(link):
+    """
+    Normaliza um link para servir de chave: host em minúsculas, sem fragmento,
+    sem parâmetros de rastreamento e sem barra final.
+    """
+    if not link:
+        return link
+    partes = urlsplit(link.strip())
+    query = urlencode([
+        (chave, valor) for chave, valor in parse_qsl(partes.query, keep_blank_values=True)
+        if not chave.lower().startswith(PARAMETROS_RASTREAMENTO)
+    ])
+    caminho = partes.path.rstrip("/") or "/"
+    return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), caminho, query, ""))
+
+
+def interpretar_data(valor) -> Optional[date]:
+    """
+    Converte as datas que aparecem nas fontes para 'date': objetos date/datetime,
+    'AAAA-MM-DD' (com ou sem hora), 'DD/MM/AAAA' e 'DD/OUT/AAAA'. Retorna None
+    se não reconhecer.
+    """
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    if not valor:
+        return None
+    texto = str(valor).strip()
+    try:
+        iso = _DATA_ISO.match(texto)
+        if iso:
+            return date(int(iso.group(1)), int(iso.group(2)), int(iso.group(3)))
+        br = _DATA_BR.match(texto)
+        if br:
+            mes = br.group(2)
+            mes = int(mes) if mes.isdigit() else MESES[mes.upper()]
+            return date(int(br.group(3)), mes, int(br.group(1)))
+    except (KeyError, ValueError):
+        pass
+    return None
+
+
+class Noticia:
+    """
+    Uma notícia ao longo de todo o fluxo (coleta -> IA -> PDF).
+
+    Usa __slots__ para ocupar pouca memória (sem __dict__ por instância).
+    'data' é sempre um 'date' (ou None) e 'chave' é o link normalizado,
+    usado para deduplicar e como chave no banco local. 'fonte' é o nome
+    exibido no relatório; 'fonte_id' identifica o coletor que a trouxe
+    (ex: "newsapi", "mme").
+
+    Os campos da IA ('relevante', 'regiao' e o 'resumo' reescrito) começam
+    vazios: 'relevante' None significa que a notícia ainda não foi analisada.
+    """
+
+    __slots__ = ("titulo", "link", "chave", "fonte", "fonte_id", "data",
+                 "descricao", "resumo", "categoria", "regiao", "relevante")
+
+    def __init__(self, titulo, link, fonte="", fonte_id="", data=None, descricao="",
+                 resumo="", categoria="-", regiao="Mundo", relevante=None):
+        self.titulo = titulo
+        self.link = link
+        self.chave = normalizar_link(link)
+        self.fonte = fonte
+        self.fonte_id = fonte_id
+        self.data = interpretar_data(data)
+        self.descricao = descricao
+        self.resumo = resumo
+        self.categoria = categoria
+        self.regiao = regiao
+        self.relevante = relevante
+
+    @property
+    def data_formatada(self) -> str:
+        """Data para exibição (DD/MM/AAAA), igual para todas as fontes."""
+        return self.data.strftime("%d/%m/%Y") if self.data else "-"
+
+    def para_dict(self) -> Dict:
+        dados = {campo: getattr(self, campo) for campo in self.__slots__ if campo != "chave"}
+        dados["data"] = self.data.isoformat() if self.data else None
+        return dados
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> "Noticia":
+        """
+        Monta a notícia a partir de um dicionário, aceitando também as chaves
+        antigas ('title', 'url', 'summary') e datas em qualquer formato conhecido.
+        """
+        return cls(
+            titulo=dados.get("titulo") or dados.get("title") or "Sem título",
+            link=dados.get("link") or dados.get("url") or "",
+            fonte=dados.get("fonte", ""),
+            fonte_id=dados.get("fonte_id", ""),
+            data=dados.get("data"),
+            descricao=dados.get("descricao", ""),
+            resumo=dados.get("resumo") or dados.get("summary") or "",
+            categoria=dados.get("categoria", "-"),
+            regiao=dados.get("regiao", "Mundo"),
+            relevante=dados.get("relevante"),
+        )
+
+    def para_json(self) -> str:
+        return json.dumps(self.para_dict(), ensure_ascii=False)
+
+    @classmethod
+    def de_json(cls, texto: str) -> "Noticia":
+        return cls.de_dict(json.loads(texto))
+
+    def __eq__(self, outra):
+        if not isinstance(outra, Noticia):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(outra, campo) for campo in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Noticia({self.titulo!r}, {self.fonte_id or self.fonte!r}, {self.data_formatada})"
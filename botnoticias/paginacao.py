@@ -0,0 +1,111 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional
+
+import requests
+import http_client
+from metricas import METRICAS
+from armazenamento import MarcasDagua
+from config import PAGINAS_MAX_FONTE
+from noticia import Noticia
+
+_marcas = None
+_lock_marcas = threading.Lock()
+
+
+def get_marcas():
+    """Marcas d'água compartilhadas pelos coletores do processo."""
+    global _marcas
+    with _lock_marcas:
+        if _marcas is None:
+            _marcas = MarcasDagua()
+        return _marcas
+
+
+def coletar_paginado(fonte: str,
+                     url_pagina: Callable[[int, int], Optional[str]],
+                     extrair_pagina: Callable[[str], List[Noticia]],
+                     desde: date = None,
+                     ate: date = None,
+                     incremental: bool = False,
+                     max_paginas: int = PAGINAS_MAX_FONTE,
+                     marcas: MarcasDagua = None) -> List[Noticia]:
+    """
+    Percorre uma listagem ordenada da notícia mais nova para a mais antiga,
+    página por página, e para assim que passar do limite.
+
+    Args:
+        fonte: nome usado para guardar a marca d'água.
+        url_pagina: (número da página, itens já lidos) -> URL, ou None se não há mais páginas.
+        extrair_pagina: HTML -> notícias (com data) na ordem da página.
+        desde: data mais antiga aceita (padrão: 7 dias antes de 'ate', ou de hoje).
+        ate: data mais recente aceita; informar 'ate' é um backfill e não mexe na marca.
+        incremental: para na marca d'água da execução anterior e só traz o que é novo.
+
+    Returns:
+        As notícias dentro do intervalo, na ordem da listagem.
+
+    Raises:
+        ValueError: se 'desde' for posterior a 'ate'.
+    """
+    desde = desde or (ate or datetime.now().date()) - timedelta(days=7)
+    if ate and desde > ate:
+        raise ValueError(f"intervalo inválido: desde ({desde}) é posterior a ate ({ate})")
+    marcas = marcas or get_marcas()
+    marca = marcas.obter(fonte) if incremental else None
+
+    coletados: List[Noticia] = []
+    # Itens descartados pelo parser desalinham 'lidos'; o conjunto evita repetir notícias
+    vistos = set()
+    lidos = paginas = 0
+    for pagina in range(max_paginas):
+        url = url_pagina(pagina, lidos)
+        if url is None:
+            break
+        try:
+            resp = http_client.get(url, timeout=10)
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Erro na requisição: {e}")
+            break
+
+        paginas += 1
+        itens = extrair_pagina(resp.text)
+        if not itens:
+            break
+        lidos += len(itens)
+
+        parar = False
+        for noticia in itens:
+            if ate and noticia.data > ate:
+                continue
+            if noticia.data < desde or (marca and noticia.data < marca[0]):
+                parar = True
+                break
+            if marca and noticia.data == marca[0] and noticia.chave in marca[1]:
+                # Mesmo dia da marca: a ordem dentro do dia não é garantida, então só pula
+                continue
+            if noticia.chave in vistos:
+                continue
+            vistos.add(noticia.chave)
+            coletados.append(noticia)
+        if parar:
+            break
+    else:
+        print(f"{fonte}: limite de {max_paginas} páginas atingido.")
+
+    if coletados and ate is None:
+        mais_recente = max(noticia.data for noticia in coletados)
+        marcas.atualizar(fonte, mais_recente, [
+            noticia.link for noticia in coletados if noticia.data == mais_recente])
+
+    METRICAS.incrementar("paginas_lidas", paginas, fonte=fonte)
+    print(f"{fonte}: {len(coletados)} notícias em {paginas} página(s).")
+    return coletados
+
+
+def url_pagina_govbr(url: str) -> Callable[[int, int], str]:
+    """Paginação das listagens do gov.br (Plone): 'b_start:int' é o número de itens já lidos."""
+    def montar(pagina, lidos):
+        return url if pagina == 0 else f"{url}?b_start:int={lidos}"
+    return montar
@@ -0,0 +1,21 @@
+import importlib.util
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml (em C) é bem mais rápido que o parser puro Python; usa-o se estiver instalado
+PARSER_HTML = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+
+def sopa(html: str, tag: str = None, classe: str = None, parser: str = None) -> BeautifulSoup:
+    """
+    Monta o BeautifulSoup da página com o parser mais rápido disponível.
+
+    Com 'tag' (e opcionalmente 'classe'), só as subárvores desses elementos
+    são materializadas: cabeçalho, menus e rodapé do gov.br são descartados
+    durante o parsing. Os seletores por descendentes continuam funcionando
+    igual, mas irmãos e pais fora dessas subárvores deixam de existir.
+    """
+    filtro = None
+    if tag:
+        filtro = SoupStrainer(tag, class_=classe) if classe else SoupStrainer(tag)
+    return BeautifulSoup(html, parser or PARSER_HTML, parse_only=filtro)
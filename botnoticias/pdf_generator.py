@@ -1,195 +1,115 @@
 from datetime import datetime
-import os
 from collections import defaultdict
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-    Spacer,
-    PageBreak,
-)
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Paragraph
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib import colors
-from reportlab.lib.utils import ImageReader  # Importação para a imagem
 from reportlab.lib.units import inch  # Importação para as unidades
+import relatorio_pdf
+from metricas import METRICAS
+from relatorio_pdf import (  # noqa: F401 (usados por renderizacao.py, pipeline.py e bench)
+    ModeloRelatorio,
+    caminho_relatorio,
+    desenhar_numero_pagina,
+    header_footer_template,
+    renderizar_parte,
+)
 
 
-# --- Configuração da Imagem do Template ---
-# Ajuste o caminho conforme necessário para o seu arquivo de imagem
-pasta_images = 'images'
-path = os.path.abspath(os.path.dirname(__file__))
-img_path = os.path.join(path, pasta_images, 'template.png')
+# Ordem fixa de seções
+REGIOES_ORDEM = ["Mundo", "Brasil", "Nordeste", "Piauí"]
 
 
-def header_footer_template(canvas, doc):
-    """Função que será chamada para desenhar o cabeçalho/rodapé em cada página,
-    incluindo a imagem de fundo/cabeçalho.
-    """
-    canvas.saveState()
-
-    page_width, page_height = A4
-
-    # --- Configurações do Template (Baseado em inseririmagem.py) ---
-    margin = 1 * inch
-
-    # 1. Desenhar a Imagem do Cabeçalho/Fundo
-    try:
-        img = ImageReader(img_path)
-
-        # Posição e dimensões para preencher a página (ajuste conforme o template)
-        # Este código do inseririmagem.py parece desenhar a imagem na página inteira
-        # ou na largura total (page_width) e altura A4[1] (altura total).
-        x_start = 0
-        y_start = 0
-
-        canvas.drawImage(
-            img,
-            x_start,
-            y_start,
-            width=page_width,
-            height=page_height,  # Usando page_height para cobrir toda a altura
-            # preserveAspectRatio=True # Descomente se quiser manter proporção
+def secoes_por_regiao(noticias):
+    """[(região, notícias)] na ordem fixa das seções, só as regiões com notícias."""
+    noticias_por_regiao = defaultdict(list)
+    for noticia in noticias:
+        noticias_por_regiao[noticia.regiao].append(noticia)
+    return [(regiao, noticias_por_regiao[regiao])
+            for regiao in REGIOES_ORDEM if regiao in noticias_por_regiao]
+
+
+class RelatorioPorRegiao(ModeloRelatorio):
+    """Relatório do main.py: uma seção por região, créditos da SUMER no fim."""
+    nome = "regiao"
+    # Adicionamos margens para que o conteúdo não fique sob o template.
+    # Ajuste as margens se o seu template for apenas para o cabeçalho.
+    margens = {
+        "topMargin": 1.5 * inch,      # Mais espaço no topo para o template
+        "bottomMargin": 0.75 * inch,  # Espaço para o rodapé
+        "leftMargin": 0.75 * inch,
+        "rightMargin": 0.75 * inch,
+    }
+    espaco_entre_noticias = 12
+    quebra_entre_secoes = True
+    creditos = True
+
+    def definir_estilos(self, styles):
+        estilos = {}
+        estilos["title"] = ParagraphStyle(
+            'TitleStyle', parent=styles['Title'], fontName="Helvetica-Bold", fontSize=22, spaceAfter=20, alignment=1)
+        estilos["subtitle"] = ParagraphStyle(
+            'SubtitleStyle', parent=styles['Normal'], fontName="Helvetica-Bold", fontSize=12, spaceAfter=30, alignment=1)
+        estilos["section"] = ParagraphStyle(
+            'SectionStyle', parent=styles['Heading1'], fontName="Helvetica-Bold", fontSize=16, spaceBefore=20, spaceAfter=10)
+        estilos["header"] = ParagraphStyle(
+            'HeaderStyle',
+            parent=styles['Heading2'],
+            fontName="Helvetica-Bold",
+            fontSize=13,
+            caseChange='upper',     # 🔠 deixa tudo maiúsculo
+            textColor=colors.HexColor("#007BFF")  # 🔹 Azul moderno
+        )
+        estilos["body"] = ParagraphStyle(
+            'BodyStyle',
+            parent=styles['Normal'],
+            fontName="Helvetica",
+            fontSize=11,
+            textColor=colors.HexColor("#555555"),
+            # alignment=TA_JUSTIFY
         )
+        return estilos
 
-    except Exception as e:
-        # Se a imagem não for encontrada, o PDF ainda será gerado.
-        print(f"Erro ao carregar imagem no template: {e}")
+    def capa(self, categoria, estilos):
+        return [
+            Paragraph(f"Relatório de Notícias - {categoria or 'Todas'}", estilos["title"]),
+            Paragraph(f"Data de geração: {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+                      estilos["subtitle"]),
+        ]
 
-    # 2. Desenhar um Rodapé: Número da Página
-    canvas.setFillColor(colors.white)
-    canvas.setFont("Helvetica-Bold", 11)
-    page_num_text = "%s" % doc.page
-    # Ajusta a posição para ser legível sobre o fundo/template
-    # 50 é um offset, margin/2 é a altura do rodapé
-    canvas.drawString(page_width - margin - 10, 10, page_num_text)
+    def secoes(self, noticias):
+        return [(regiao.upper(), noticias_regiao)
+                for regiao, noticias_regiao in secoes_por_regiao(noticias)]
 
-    canvas.restoreState()
+    def elementos_noticia(self, numero, noticia, estilos):
+        # Parágrafos do cache de blocos: a mesma notícia em outro relatório
+        # do processo (ex: bruto e Energia) não é montada de novo
+        elementos = [
+            self.paragrafo(f"{numero}. <a href='{noticia.link}'>{noticia.titulo}</a>", "header")]
+        if noticia.resumo:
+            elementos.append(
+                self.paragrafo(f"Resumo: {noticia.resumo}", "body"))
+        elementos.append(
+            self.paragrafo(f"Fonte: {noticia.fonte or 'Desconhecida'}", "body"))
+        elementos.append(
+            self.paragrafo(f"Data: {noticia.data_formatada}", "body"))
+        # elementos.append(
+        # self.paragrafo(f"Categoria: {noticia.categoria}", "body"))
+        return elementos
+
+
+MODELO = RelatorioPorRegiao()
+
+
+def dividir_em_partes(noticias, categoria=None, noticias_por_parte=150):
+    """Partes do relatório por região para o ServicoRenderizacao (ver relatorio_pdf.py)."""
+    return relatorio_pdf.dividir_em_partes(MODELO, noticias, categoria, noticias_por_parte)
 
 
 def gerar_pdf(noticias, nome_arquivo="noticias.pdf", categoria=None):
-    # Cria o documento. Adicionamos margens para que o conteúdo não fique sob o template.
-    # Ajuste as margens se o seu template for apenas para o cabeçalho.
-    margin_top_content = 1.5 * inch  # Mais espaço no topo para o template
-    margin_bottom_content = 0.75 * inch  # Espaço para o rodapé
-    margin_sides = 0.75 * inch
-
-    # Pasta onde os PDFs serão salvos
-    pasta_pdf = "relatorios"
-    # 2. Constrói o caminho completo: "relatorios/" + nome_arquivo
-    caminho_completo = os.path.join(path, pasta_pdf, nome_arquivo)
-
-    # 3. Cria a pasta 'relatorios' se ela não existir
-    if not os.path.exists(pasta_pdf):
-        os.makedirs(pasta_pdf)
-    # -----------------------------------------------------------
-
-    doc = SimpleDocTemplate(
-        caminho_completo,
-        pagesize=A4,
-        topMargin=margin_top_content,
-        bottomMargin=margin_bottom_content,
-        leftMargin=margin_sides,
-        rightMargin=margin_sides
-    )
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        'TitleStyle', parent=styles['Title'], fontName="Helvetica-Bold", fontSize=22, spaceAfter=20, alignment=1)
-    subtitle_style = ParagraphStyle(
-        'SubtitleStyle', parent=styles['Normal'], fontName="Helvetica-Bold", fontSize=12, spaceAfter=30, alignment=1)
-    section_style = ParagraphStyle(
-        'SectionStyle', parent=styles['Heading1'], fontName="Helvetica-Bold", fontSize=16, spaceBefore=20, spaceAfter=10)
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        parent=styles['Heading2'],
-        fontName="Helvetica-Bold",
-        fontSize=13,
-        caseChange='upper',     # 🔠 deixa tudo maiúsculo
-        textColor=colors.HexColor("#007BFF")  # 🔹 Azul moderno
-    )
-    body_style = ParagraphStyle(
-        'BodyStyle',
-        parent=styles['Normal'],
-        fontName="Helvetica",
-        fontSize=11,
-        textColor=colors.HexColor("#555555"),
-        # alignment=TA_JUSTIFY
-    )
-    section_equipe_style = ParagraphStyle(
-        'SectionEquipeStyle', parent=styles['Heading1'], fontName="Helvetica-Bold", fontSize=14, spaceBefore=20, spaceAfter=10, alignment=1)
-    nome_style = ParagraphStyle(
-        'NomeStyle',
-        parent=styles['Normal'],
-        fontName="Helvetica",
-        fontSize=12,
-        # textColor=colors.HexColor("#555555"),
-        alignment=1,
-        spaceAfter=5
-    )
-
-    elementos = []
-    # Capa
-    elementos.append(
-        Paragraph(f"Relatório de Notícias - {categoria or 'Todas'}", title_style))
-    elementos.append(Paragraph(
-        f"Data de geração: {datetime.now().strftime('%d/%m/%Y %H:%M')}", subtitle_style))
-
-    # Agrupa notícias por região
-    noticias_por_regiao = defaultdict(list)
-    for noticia in noticias:
-        regiao = noticia.get("regiao", "Mundo")
-        noticias_por_regiao[regiao].append(noticia)
-
-    # Ordem fixa de seções
-    regioes_ordem = ["Mundo", "Brasil", "Nordeste", "Piauí"]
-
-    for regiao in regioes_ordem:
-        if regiao in noticias_por_regiao:
-            elementos.append(Paragraph(f"{regiao.upper()}", section_style))
-            for i, noticia in enumerate(noticias_por_regiao[regiao], 1):
-                elementos.append(
-                    Paragraph(f"{i}. <a href='{noticia.get('link')}'>{noticia.get('titulo', 'Sem título')}</a>", header_style))
-                if noticia.get("resumo"):
-                    elementos.append(
-                        Paragraph(f"Resumo: {noticia.get('resumo')}", body_style))
-                elementos.append(
-                    Paragraph(f"Fonte: {noticia.get('fonte', 'Desconhecida')}", body_style))
-                elementos.append(
-                    Paragraph(f"Data: {noticia.get('data', '-')}", body_style))
-                # elementos.append(
-                # Paragraph(f"Categoria: {noticia.get('categoria', '-')}", body_style))
-                elementos.append(Spacer(1, 12))
-            elementos.append(PageBreak())
-
-    elementos.append(
-        Paragraph("ORGANIZAÇÃO E ELABORAÇÃO – SUMER", section_equipe_style))
-    elementos.append(Paragraph(
-        "SUPERINTENDÊNCIA DE MINERAÇÃO E ENERGIAS RENOVÁVEIS (SUMER)", section_equipe_style))
-    elementos.append(Paragraph(
-        "Bruno Casanova Cerullo", nome_style))
-    elementos.append(Paragraph(
-        "Diretoria de Mineração e Energias Renováveis (DIMER)", section_equipe_style))
-    elementos.append(Paragraph(
-        "Gabriela Oliveira Rodrigues", nome_style))
-    elementos.append(Paragraph(
-        "Gerência de Energias Renováveis (GEER)", section_equipe_style))
-    elementos.append(Paragraph(
-        "Hizadora Silva Lima", nome_style))
-    elementos.append(Paragraph(
-        "Gerência de Planejamento e Relações Institucionais (GEPL)", section_equipe_style))
-    elementos.append(Paragraph(
-        "Jéssica Mayara Mendes de Sousa", nome_style))
-    elementos.append(Paragraph(
-        "Equipe de Elaboração", section_equipe_style))
-    elementos.append(Paragraph(
-        "Breno Avelar Rodrigues de Andrade", nome_style))
-    elementos.append(Paragraph(
-        "Hizadora Silva Lima", nome_style))
-
-    # Constrói o documento, passando a função do template para 'onFirstPage' e 'onLaterPages'
-    doc.build(
-        elementos,
-        onFirstPage=header_footer_template,
-        onLaterPages=header_footer_template
-    )
-    print(f"✅ PDF gerado: {caminho_completo}")
+    """
+    Gera o relatório com as notícias agrupadas por região e grava em
+    relatorios/ de forma atômica (nunca fica um PDF pela metade). Retorna o
+    caminho do arquivo.
+    """
+    with METRICAS.cronometrar("pdf_render", arquivo=nome_arquivo):
+        return relatorio_pdf.gerar_relatorio(MODELO, noticias, nome_arquivo, categoria)
@@ -0,0 +1,257 @@
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+
+from armazenamento import CAMPOS_IA, RESUMO_ERRO_IA, ArmazemNoticias
+from cache_ia import CacheClassificacao
+from checkpoint import CheckpointExecucao
+from coleta import coletar_em_fluxo
+from config import CHECKPOINT_INTERVALO_IA, GEMINI_MODEL
+from ia_filter import (LIMITADOR, aplicar_do_cache, classificar_em_fluxo,
+                       montar_lotes_por_tokens, registrar_resultado)
+from metricas import METRICAS
+from noticia import Noticia
+from pdf_generator import caminho_relatorio
+from prefiltro import ADIADA, PRIORITARIA, PreFiltro
+from renderizacao import ServicoRenderizacao, TrabalhoPDF
+
+# Categoria -> nome do PDF de notícias relevantes ({data} = DD-MM-AAAA)
+RELATORIOS_CATEGORIA = {
+    "Energia": "Notícias_Energia_relevantes_{data}.pdf",
+    "Mineração": "Notícias_Mineracao_relevantes_{data}.pdf",
+}
+
+
+class RelatorioCategoria:
+    """
+    Junta as notícias relevantes de uma categoria à medida que a
+    classificação delas termina. O PDF só é montado no fim (o ReportLab
+    precisa da história inteira), mantendo a ordem da coleta.
+    """
+
+    def __init__(self, categoria, nome_arquivo):
+        self.categoria = categoria
+        self.nome_arquivo = nome_arquivo
+        self._noticias = []  # (posição na coleta, notícia)
+
+    def adicionar(self, posicao, noticia):
+        self._noticias.append((posicao, noticia))
+
+    def __len__(self):
+        return len(self._noticias)
+
+    def trabalho(self):
+        """O relatório pronto para o ServicoRenderizacao, na ordem da coleta."""
+        noticias = [noticia for _, noticia in sorted(self._noticias, key=lambda par: par[0])]
+        return TrabalhoPDF(noticias, self.nome_arquivo, self.categoria)
+
+
+async def executar_pipeline(max_por_query=7, debug=True, gerar_bruto=True, retomar=False,
+                            checkpoint=None, servico=None):
+    """
+    Coleta, deduplica, classifica e monta os relatórios em etapas sobrepostas.
+
+    A coleta roda numa thread e cada notícia nova (já deduplicada) entra na
+    triagem assim que chega: o que já está no banco local ou no cache da IA
+    vai direto para o relatório da categoria; o resto entra na fila do
+    Gemini, que dispara um lote assim que ele enche, sem esperar a coleta
+    acabar. O pré-filtro descarta os falsos positivos claros, e as notícias
+    sem termos do setor só entram na fila depois da coleta, atrás das outras. O PDF bruto é renderizado enquanto a
+    classificação continua. Assim o tempo total fica perto da etapa mais
+    lenta, e não da soma delas.
+
+    Cada etapa grava um checkpoint do dia (ver checkpoint.py). Com
+    'retomar', a coleta é lida do checkpoint em vez das APIs, as notícias
+    já classificadas não voltam ao Gemini e os PDFs terminados não são
+    gerados de novo. Sem 'retomar', os checkpoints do dia são descartados.
+
+    'servico' é um ServicoRenderizacao já aberto (o do agendador, mantido
+    entre execuções); sem ele, um é criado e fechado no fim.
+    """
+    inicio = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    modelo = GEMINI_MODEL or "gemini-2.5-flash"
+    data_str = datetime.now().strftime('%d-%m-%Y')
+    relatorios = {categoria: RelatorioCategoria(categoria, nome.format(data=data_str))
+                  for categoria, nome in RELATORIOS_CATEGORIA.items()}
+
+    todas = []        # Ordem da coleta, para salvar e ordenar os relatórios
+    posicoes = {}     # id(notícia) -> posição em 'todas'
+    brutas = []       # Cópias como vieram da coleta, para o PDF bruto
+    pendentes = []    # Ainda não classificadas em execuções anteriores
+    para_ia = []      # Passaram pelo pré-filtro
+    adiadas = []      # Sem termos claros do setor: vão por último para a IA
+    chegadas = asyncio.Queue()
+    prefiltro = PreFiltro()
+    # Os PDFs são renderizados em outros processos, enquanto a IA trabalha
+    servico_proprio = servico is None
+    servico = servico or ServicoRenderizacao()
+    espera_inicial = LIMITADOR.tempo_espera_total  # O limitador vive entre execuções
+    pdfs = {}  # nome do arquivo -> future do PDF
+    marcando = threading.Lock()
+    parar = threading.Event()  # Avisa a thread da coleta que ninguém mais consome
+
+    checkpoint = checkpoint or CheckpointExecucao()
+    coletadas, ja_classificadas, ja_renderizados = None, {}, set()
+    if retomar:
+        coletadas = checkpoint.carregar_noticias("coletadas")
+        ja_classificadas = {n.chave: n for n in checkpoint.carregar_noticias("classificadas") or []}
+        ja_renderizados = checkpoint.renderizados()
+        print(f"♻️ Retomando {checkpoint.execucao}: coleta "
+              f"{'reaproveitada' if coletadas is not None else 'refeita'}, "
+              f"{len(ja_classificadas)} classificadas, {len(ja_renderizados)} PDF(s) prontos")
+    else:
+        checkpoint.limpar()
+
+    def produzir():
+        try:
+            fonte = coletadas if coletadas is not None else coletar_em_fluxo(
+                max_por_query=max_por_query, debug=debug)
+            for noticia in fonte:
+                if parar.is_set():
+                    break
+                loop.call_soon_threadsafe(chegadas.put_nowait, noticia)
+        finally:
+            loop.call_soon_threadsafe(chegadas.put_nowait, None)  # Fim da coleta
+
+    def concluir(noticia):
+        relatorio = relatorios.get(noticia.categoria)
+        if noticia.relevante and relatorio is not None:
+            relatorio.adicionar(posicoes[id(noticia)], noticia)
+
+    def gravar_classificadas():
+        checkpoint.salvar_noticias("classificadas", [
+            n for n in todas if n.relevante is not None and n.resumo != RESUMO_ERRO_IA])
+
+    def renderizar_uma_vez(trabalho):
+        nome_arquivo = trabalho.nome_arquivo
+        if nome_arquivo in ja_renderizados and os.path.exists(caminho_relatorio(nome_arquivo)):
+            print(f"⏭️ {nome_arquivo} já gerado, pulando.")
+            return
+        futuro = servico.enviar(trabalho)
+
+        def marcar(f):
+            # Roda na thread que concluiu o PDF; vale mesmo se o pipeline cair depois
+            if not f.exception():
+                with marcando:
+                    checkpoint.marcar_renderizado(nome_arquivo)
+        futuro.add_done_callback(marcar)
+        pdfs[nome_arquivo] = asyncio.wrap_future(futuro)
+
+    def enviar_para_ia(noticia):
+        """False se a classificação já veio do cache da IA."""
+        para_ia.append(noticia)
+        if cache and aplicar_do_cache(cache, modelo, noticia):
+            concluir(noticia)
+            return False
+        return True
+
+    async def triagem(armazem):
+        while True:
+            noticia = await chegadas.get()
+            if noticia is None:
+                break
+            posicoes[id(noticia)] = len(todas)
+            todas.append(noticia)
+            brutas.append(Noticia.de_dict(noticia.para_dict()))
+
+            salva = ja_classificadas.get(noticia.chave)
+            if salva is not None:
+                for campo in CAMPOS_IA:
+                    setattr(noticia, campo, getattr(salva, campo))
+                concluir(noticia)
+                continue
+            if armazem.aplicar_classificacao(noticia):
+                concluir(noticia)
+                continue
+            pendentes.append(noticia)
+            avaliacao = prefiltro.avaliar(noticia)
+            if avaliacao == PRIORITARIA:
+                if enviar_para_ia(noticia):
+                    yield noticia
+            elif avaliacao == ADIADA:
+                adiadas.append(noticia)
+
+        print(f"📥 Coletadas {len(todas)} notícias")
+        # As etapas se sobrepõem: registra quando cada uma terminou, desde o início
+        METRICAS.definir("etapa_concluida_em_segundos", round(time.perf_counter() - inicio, 3),
+                         etapa="coleta")
+        METRICAS.incrementar("noticias_coletadas", len(todas))
+        if coletadas is None:
+            checkpoint.salvar_noticias("coletadas", brutas)
+        if gerar_bruto:
+            arquivo_bruto = f"noticias_brutas_{datetime.now().strftime('%d%m%Y')}.pdf"
+            renderizar_uma_vez(TrabalhoPDF(brutas, arquivo_bruto, "Todas"))
+
+        for noticia in adiadas:
+            if enviar_para_ia(noticia):
+                yield noticia
+
+    cache = CacheClassificacao()
+    coleta = loop.run_in_executor(None, produzir)
+    try:
+        with ArmazemNoticias() as armazem:
+            classificadas = 0
+            try:
+                async for noticia, dados_ia in classificar_em_fluxo(
+                        triagem(armazem), model_name=modelo, debug=debug):
+                    registrar_resultado(cache, modelo, noticia, dados_ia)
+                    concluir(noticia)
+                    classificadas += 1
+                    if classificadas % CHECKPOINT_INTERVALO_IA == 0:
+                        gravar_classificadas()
+                await coleta  # Propaga erros da coleta, se houver
+            finally:
+                # Mesmo se a IA ou a coleta falharem, o que já foi classificado fica salvo
+                gravar_classificadas()
+                METRICAS.definir("etapa_concluida_em_segundos",
+                                 round(time.perf_counter() - inicio, 3), etapa="classificacao")
+                METRICAS.definir("gemini_espera_rate_limit_segundos",
+                                 round(LIMITADOR.tempo_espera_total - espera_inicial, 3))
+            armazem.salvar(todas)
+    except BaseException:
+        # A coleta só pode terminar com o loop ainda aberto: senão a thread
+        # seguiria postando notícias num loop fechado
+        parar.set()
+        try:
+            await coleta
+        except Exception:
+            pass  # O erro que interrompeu o consumo é o que sobe
+        if servico_proprio:
+            servico.fechar()
+        raise
+    finally:
+        cache.fechar()
+
+    print(prefiltro.resumo())
+    economizadas = len(montar_lotes_por_tokens(pendentes)) - len(montar_lotes_por_tokens(para_ia))
+    print(f"   → {economizadas} chamadas ao Gemini economizadas")
+    print(f"🤖 {classificadas} notícias classificadas pelo Gemini")
+    print(cache.resumo())
+    METRICAS.incrementar("noticias_classificadas_ia", classificadas)
+    METRICAS.incrementar("prefiltro_descartadas", prefiltro.contadores["descartadas"])
+    METRICAS.incrementar("prefiltro_adiadas", prefiltro.contadores["adiadas"])
+    METRICAS.incrementar("prefiltro_chamadas_economizadas", economizadas)
+    METRICAS.incrementar("cache_ia_acertos", cache.acertos)
+    for categoria, relatorio in relatorios.items():
+        print(f"{'⚡' if categoria == 'Energia' else '⛏️'} {categoria} relevantes: {len(relatorio)}")
+        METRICAS.incrementar("noticias_relevantes", len(relatorio), categoria=categoria)
+
+    try:
+        for relatorio in relatorios.values():
+            if len(relatorio):
+                renderizar_uma_vez(relatorio.trabalho())
+        resultados = await asyncio.gather(*pdfs.values(), return_exceptions=True)
+    finally:
+        if servico_proprio:
+            servico.fechar()
+    falhas = [resultado for resultado in resultados if isinstance(resultado, BaseException)]
+    if falhas:
+        raise falhas[0]
+
+    METRICAS.definir("etapa_concluida_em_segundos", round(time.perf_counter() - inicio, 3),
+                     etapa="relatorios")
+    print(f"⏱️ Pipeline concluído em {time.perf_counter() - inicio:.1f}s")
+    return todas
@@ -0,0 +1,162 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+from config import ENERGIA_KEYWORDS, MINERACAO_KEYWORDS, QUERIES, STOPWORDS_FALSOS_POSITIVOS
+
+
+def _tabela_sem_acentos():
+    """Tabela para str.translate que remove acentos do Latin-1 (bem mais rápido que NFKD)."""
+    tabela = {}
+    for codigo in range(0xC0, 0x180):
+        caractere = chr(codigo)
+        base = unicodedata.normalize("NFKD", caractere)[0]
+        if base != caractere and base.isascii():
+            tabela[codigo] = base
+    return tabela
+
+
+_SEM_ACENTOS = _tabela_sem_acentos()
+
+
+def dobrar_acentos(texto):
+    """Minúsculas e sem acentos: 'Mineração' -> 'mineracao'."""
+    return texto.lower().translate(_SEM_ACENTOS)
+
+
+# Terminações de plural irregular e do singular correspondente, cortadas
+# inteiras para que as duas formas caiam no mesmo radical
+# (leilão/leilões -> 'leil', combustível/combustíveis -> 'combust')
+_TERMINACOES = ("oes", "aes", "aos", "eis", "ais", "ois", "ao", "el", "il", "al", "ol")
+
+
+@lru_cache(maxsize=50000)
+def radical(palavra):
+    """
+    Radical de uma palavra já sem acentos, só o suficiente para o plural e
+    o singular coincidirem ('usinas' -> 'usina', 'gases' -> 'gas',
+    'fosseis' -> 'foss'). Nunca deixa menos de 3 letras.
+    """
+    for terminacao in _TERMINACOES:
+        if palavra.endswith(terminacao) and len(palavra) - len(terminacao) >= 3:
+            return palavra[:-len(terminacao)]
+    for letra in "ses":  # -s, depois -e (gases -> gase -> gas), depois -s de novo
+        if palavra.endswith(letra) and len(palavra) > 3:
+            palavra = palavra[:-1]
+    return palavra
+
+
+def normalizar(texto):
+    """Texto sem acentos, com cada palavra reduzida ao radical e separada por um espaço."""
+    return " ".join(radical(palavra) for palavra in re.findall(r"\w+", dobrar_acentos(texto)))
+
+
+def termos_das_consultas(consultas=QUERIES):
+    """
+    {categoria: termos} das consultas de config.QUERIES. O nome da categoria
+    no fim da consulta só serve para a busca ('cobre mineração'), então sai
+    do termo: a notícia fala de 'cobre'.
+    """
+    termos = {}
+    for categoria, lista in consultas.items():
+        sufixo = " " + dobrar_acentos(categoria)
+        termos[categoria] = [consulta[:-len(sufixo)] if dobrar_acentos(consulta).endswith(sufixo)
+                             else consulta for consulta in lista]
+    return termos
+
+
+def _regex_trie(termos):
+    """
+    Monta uma alternância em forma de trie ('gas natural|garimpo' vira
+    'ga(?:s natural|rimpo)'), que o motor de regex percorre sem testar cada
+    termo do zero em toda posição. Termos mais longos vêm primeiro em cada nó.
+    """
+    trie = {}
+    for termo in termos:
+        no = trie
+        for caractere in termo:
+            no = no.setdefault(caractere, {})
+        no[""] = True
+
+    def montar(no):
+        fim = no.get("") is True
+        ramos = [re.escape(c) + montar(filho)
+                 for c, filho in sorted(no.items()) if c != ""]
+        if not ramos:
+            return ""
+        corpo = ramos[0] if len(ramos) == 1 else "(?:" + "|".join(ramos) + ")"
+        if fim:
+            # Prefere o termo mais longo, mas aceita parar aqui
+            return "(?:" + corpo + ")?"
+        return corpo
+
+    return montar(trie)
+
+
+# Resultado da avaliação de cada notícia
+PRIORITARIA = "prioritaria"  # Tem termos do setor: vai logo para a IA
+ADIADA = "adiada"            # Sem termos claros do setor: vai para a IA depois das outras
+DESCARTADA = "descartada"    # Só termos de falso positivo: não vai para a IA
+
+
+class PreFiltro:
+    """
+    Pré-filtro local por palavras-chave, rodado antes do Gemini.
+
+    As palavras-chave e as consultas de config.py viram uma única expressão
+    regular sobre o texto normalizado (sem acentos e com cada palavra no
+    radical, então 'usinas termelétricas' casa com 'usina termelétrica'),
+    organizada como uma trie. Os termos casam palavras inteiras, e os mais
+    longos têm prioridade ('ouro olímpico' vence 'ouro').
+
+    Regras:
+    - nenhum termo do setor e algum termo de falso positivo (ex: futebol)
+      -> descartada, com relevante=False, sem passar pela IA;
+    - nenhum termo do setor, ou falso positivo com no máximo um termo do
+      setor -> adiada: vai para a IA, mas depois das outras;
+    - demais -> prioritária.
+    Só o caso mais claro é descartado: a coleta já vem de buscas do setor,
+    então uma notícia sem termos conhecidos ainda pode ser relevante.
+    """
+
+    def __init__(self, energia=ENERGIA_KEYWORDS, mineracao=MINERACAO_KEYWORDS,
+                 falsos_positivos=STOPWORDS_FALSOS_POSITIVOS, consultas=QUERIES):
+        das_consultas = termos_das_consultas(consultas)
+        self._grupo = {}
+        for grupo, termos in (("Energia", list(energia) + das_consultas.get("Energia", [])),
+                              ("Mineração", list(mineracao) + das_consultas.get("Mineração", [])),
+                              ("falso", falsos_positivos)):
+            for termo in termos:
+                self._grupo.setdefault(normalizar(termo), grupo)
+        self._regex = re.compile(r"\b(" + _regex_trie(self._grupo) + r")\b")
+        self.contadores = {"avaliadas": 0, "descartadas": 0, "adiadas": 0}
+
+    def pontuar(self, texto):
+        """Retorna quantos termos de cada grupo aparecem no texto."""
+        pontos = {"Energia": 0, "Mineração": 0, "falso": 0}
+        for termo in self._regex.findall(normalizar(texto)):
+            pontos[self._grupo[termo]] += 1
+        return pontos
+
+    def avaliar(self, noticia):
+        """
+        PRIORITARIA, ADIADA ou DESCARTADA (esta já marcada com
+        relevante=False).
+        """
+        self.contadores["avaliadas"] += 1
+        pontos = self.pontuar(f"{noticia.titulo} {noticia.descricao}")
+        do_setor = pontos["Energia"] + pontos["Mineração"]
+
+        if do_setor == 0 and pontos["falso"]:
+            self.contadores["descartadas"] += 1
+            noticia.relevante = False
+            return DESCARTADA
+        if do_setor == 0 or (pontos["falso"] and do_setor <= 1):
+            self.contadores["adiadas"] += 1
+            return ADIADA
+        return PRIORITARIA
+
+    def resumo(self):
+        c = self.contadores
+        return (f"🔎 Pré-filtro: {c['descartadas']} de {c['avaliadas']} notícias descartadas "
+                f"sem passar pela IA, {c['adiadas']} enviadas por último")
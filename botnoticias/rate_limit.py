@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+
+class LimitadorTokens:
+    """
+    Token bucket duplo para a API do Gemini: um balde de requisições (RPM) e
+    outro de tokens (TPM). Cada chamada reserva 1 requisição e uma estimativa
+    de tokens; depois da resposta, 'registrar_uso' corrige o balde com a
+    contagem real de 'usage_metadata'.
+
+    Diferente de uma espera fixa entre chamadas, permite várias requisições
+    em andamento ao mesmo tempo enquanto houver saldo nos dois baldes. É
+    seguro para uso por várias threads e por corrotinas (asyncio).
+    """
+
+    def __init__(self, rpm, tpm=None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requisicoes = float(rpm)
+        self._tokens = float(tpm) if tpm else 0.0
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+        self.tempo_espera_total = 0.0
+
+    def _repor(self, agora):
+        decorrido = agora - self._ultimo
+        self._ultimo = agora
+        self._requisicoes = min(self.rpm, self._requisicoes + decorrido * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + decorrido * self.tpm / 60)
+
+    def _tentar_reservar(self, tokens):
+        """Reserva se houver saldo; senão retorna quantos segundos esperar."""
+        with self._lock:
+            self._repor(time.monotonic())
+            # Um pedido maior que o balde inteiro só precisa do balde cheio
+            tokens = min(tokens, self.tpm) if self.tpm else 0
+            falta_req = 1 - self._requisicoes
+            falta_tok = tokens - self._tokens if self.tpm else 0
+            if falta_req <= 0 and falta_tok <= 0:
+                self._requisicoes -= 1
+                self._tokens -= tokens
+                return 0.0
+            espera_req = max(falta_req, 0) * 60 / self.rpm
+            espera_tok = max(falta_tok, 0) * 60 / self.tpm if self.tpm else 0
+            return max(espera_req, espera_tok)
+
+    def aguardar(self, tokens=0):
+        """Bloqueia a thread até poder fazer uma requisição de ~'tokens' tokens."""
+        while True:
+            espera = self._tentar_reservar(tokens)
+            if espera <= 0:
+                return
+            self._registrar_espera(espera)
+            time.sleep(espera)
+
+    async def aguardar_async(self, tokens=0):
+        """Versão assíncrona de 'aguardar' (não bloqueia o event loop)."""
+        while True:
+            espera = self._tentar_reservar(tokens)
+            if espera <= 0:
+                return
+            self._registrar_espera(espera)
+            await asyncio.sleep(espera)
+
+    def _registrar_espera(self, espera):
+        with self._lock:
+            self.tempo_espera_total += espera
+        print(f"⏳ Esperando {espera:.2f}s (Rate Limit)...")
+
+    def registrar_uso(self, tokens_reais, tokens_estimados):
+        """Ajusta o balde de tokens pela diferença entre o uso real e o estimado."""
+        if not self.tpm or tokens_reais is None:
+            return
+        with self._lock:
+            self._tokens -= tokens_reais - min(tokens_estimados, self.tpm)
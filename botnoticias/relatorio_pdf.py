@@ -0,0 +1,327 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+from copy import copy
+
+from reportlab.lib import colors
+from reportlab.lib.fonts import ps2tt, tt2ps
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
+from checkpoint import escrever_atomico
+from config import RENDER_CACHE_PARAGRAFOS
+from template_pdf import desenhar_template, imagem_template
+
+# Motor único dos relatórios em PDF. O que muda entre os relatórios (estilos,
+# capa, agrupamento em seções, bloco de cada notícia) fica num ModeloRelatorio
+# (pdf_generator.py: por região; pdf_generator_gov.py: por fonte oficial).
+# Estilos, fontes e a página de créditos são criados uma vez por processo.
+
+# A imagem do template (images/template.png) é configurada em template_pdf.py
+path = os.path.abspath(os.path.dirname(__file__))
+
+# Equipe da SUMER na página final: (estilo, texto)
+CREDITOS_SUMER = [
+    ("secao", "ORGANIZAÇÃO E ELABORAÇÃO – SUMER"),
+    ("secao", "SUPERINTENDÊNCIA DE MINERAÇÃO E ENERGIAS RENOVÁVEIS (SUMER)"),
+    ("nome", "Bruno Casanova Cerullo"),
+    ("secao", "Diretoria de Mineração e Energias Renováveis (DIMER)"),
+    ("nome", "Gabriela Oliveira Rodrigues"),
+    ("secao", "Gerência de Energias Renováveis (GEER)"),
+    ("nome", "Hizadora Silva Lima"),
+    ("secao", "Gerência de Planejamento e Relações Institucionais (GEPL)"),
+    ("nome", "Jéssica Mayara Mendes de Sousa"),
+    ("secao", "Equipe de Elaboração"),
+    ("nome", "Breno Avelar Rodrigues de Andrade"),
+    ("nome", "Hizadora Silva Lima"),
+]
+
+_folha = None
+_estilos = {}
+_creditos = None
+_paragrafos = OrderedDict()  # (modelo, estilo, texto) -> ParagrafoMedido, do mais antigo ao mais recente
+_lock = threading.Lock()
+
+
+def caminho_relatorio(nome_arquivo):
+    """Caminho completo do PDF na pasta 'relatorios' ao lado deste módulo."""
+    return os.path.join(path, "relatorios", nome_arquivo)
+
+
+def desenhar_numero_pagina(canvas, numero):
+    """Número da página no rodapé, em branco sobre o fundo do template."""
+    page_width, _ = A4
+    margin = 1 * inch
+    canvas.setFillColor(colors.white)
+    canvas.setFont("Helvetica-Bold", 11)
+    # Ajusta a posição para ser legível sobre o fundo/template
+    # 50 é um offset, margin/2 é a altura do rodapé
+    canvas.drawString(page_width - margin - 10, 10, "%s" % numero)
+
+
+def header_footer_template(canvas, doc):
+    """Função que será chamada para desenhar o cabeçalho/rodapé em cada página,
+    incluindo a imagem de fundo/cabeçalho.
+    """
+    canvas.saveState()
+
+    # 1. Desenhar a Imagem do Cabeçalho/Fundo (página inteira)
+    # A imagem é preparada uma vez por processo e embutida uma vez por PDF
+    try:
+        desenhar_template(canvas, imagem_template())
+
+    except Exception as e:
+        # Se a imagem não for encontrada, o PDF ainda será gerado.
+        print(f"Erro ao carregar imagem no template: {e}")
+
+    # 2. Desenhar um Rodapé: Número da Página
+    # (partes de um relatório dividido são numeradas depois de juntadas)
+    if getattr(doc, "numerar_paginas", True):
+        desenhar_numero_pagina(canvas, doc.page)
+
+    canvas.restoreState()
+
+
+class ModeloRelatorio:
+    """
+    Estratégia de um tipo de relatório. O motor monta sempre capa, seções
+    e (opcionalmente) créditos; a subclasse diz como:
+
+    - definir_estilos(folha): os ParagraphStyle do modelo (chamado uma vez
+      por processo, a partir do getSampleStyleSheet);
+    - capa(categoria, estilos): os flowables da primeira página;
+    - secoes(noticias): [(título da seção, notícias)], na ordem do relatório;
+    - elementos_noticia(numero, noticia, estilos): o bloco de uma notícia.
+    """
+    nome = "base"
+    margens = {}  # Argumentos do SimpleDocTemplate (vazio = margens padrão)
+    espaco_entre_noticias = 12
+    quebra_entre_secoes = True  # Cada seção começa numa página nova
+    creditos = False            # Página da equipe SUMER no fim
+
+    def definir_estilos(self, folha):
+        raise NotImplementedError
+
+    def capa(self, categoria, estilos):
+        raise NotImplementedError
+
+    def secoes(self, noticias):
+        raise NotImplementedError
+
+    def elementos_noticia(self, numero, noticia, estilos):
+        raise NotImplementedError
+
+    def titulo_secao(self, titulo, numero_inicial=1):
+        return titulo if numero_inicial == 1 else f"{titulo} (continuação)"
+
+    def paragrafo(self, texto, estilo):
+        """Parágrafo no estilo 'estilo' do modelo, vindo do cache de blocos."""
+        return paragrafo(self, estilo, texto)
+
+
+class ParagrafoMedido(Paragraph):
+    """
+    Paragraph que lembra a quebra de linhas de cada largura em que já foi
+    medido. As cópias rasas do cache compartilham o texto interpretado e
+    essas medidas, então a mesma notícia em outro relatório (ou o mesmo
+    "Fonte: ..." repetido) não é interpretada nem medida de novo.
+    """
+
+    def wrap(self, availWidth, availHeight):
+        medidas = self.__dict__.get("_medidas")
+        if medidas is None:  # Partes criadas pelo split seguem o caminho normal
+            return super().wrap(availWidth, availHeight)
+        medida = medidas.get(availWidth)
+        if medida is None:
+            super().wrap(availWidth, availHeight)
+            medidas[availWidth] = medida = (self._wrapWidths, self.blPara, self.height)
+        self.width = availWidth
+        self._wrapWidths, self.blPara, self.height = medida
+        return self.width, self.height
+
+
+def _folha_base():
+    global _folha
+    if _folha is None:
+        _folha = getSampleStyleSheet()
+    return _folha
+
+
+def estilos(modelo):
+    """Os estilos do modelo, criados na primeira vez e reaproveitados no processo."""
+    with _lock:
+        if modelo.nome not in _estilos:
+            _estilos[modelo.nome] = modelo.definir_estilos(_folha_base())
+        return _estilos[modelo.nome]
+
+
+def _estilos_creditos(folha):
+    return {
+        "secao": ParagraphStyle(
+            'SectionEquipeStyle', parent=folha['Heading1'], fontName="Helvetica-Bold", fontSize=14,
+            spaceBefore=20, spaceAfter=10, alignment=1),
+        "nome": ParagraphStyle(
+            'NomeStyle',
+            parent=folha['Normal'],
+            fontName="Helvetica",
+            fontSize=12,
+            # textColor=colors.HexColor("#555555"),
+            alignment=1,
+            spaceAfter=5
+        ),
+    }
+
+
+def creditos_sumer():
+    """
+    A página de créditos. Os parágrafos são montados uma vez por processo;
+    cada relatório recebe cópias rasas (o layout de um documento não vaza
+    para o outro, e o texto já interpretado é compartilhado).
+    """
+    global _creditos
+    with _lock:
+        if _creditos is None:
+            estilos_creditos = _estilos_creditos(_folha_base())
+            _creditos = [Paragraph(texto, estilos_creditos[estilo])
+                         for estilo, texto in CREDITOS_SUMER]
+    return [copy(paragrafo) for paragrafo in _creditos]
+
+
+def paragrafo(modelo, estilo, texto):
+    """
+    Cache de blocos das notícias, por processo e com limite de
+    RENDER_CACHE_PARAGRAFOS entradas (descarta os menos usados). A chave é
+    o texto com a marcação e o estilo; cada uso recebe uma cópia rasa.
+    """
+    if not RENDER_CACHE_PARAGRAFOS:
+        return Paragraph(texto, estilos(modelo)[estilo])
+    chave = (modelo.nome, estilo, texto)
+    with _lock:
+        original = _paragrafos.get(chave)
+        if original is not None:
+            _paragrafos.move_to_end(chave)
+    if original is None:
+        original = ParagrafoMedido(texto, estilos(modelo)[estilo])
+        original._medidas = {}
+        with _lock:
+            _paragrafos[chave] = original
+            if len(_paragrafos) > RENDER_CACHE_PARAGRAFOS:
+                _paragrafos.popitem(last=False)
+    return copy(original)
+
+
+def preparar(*modelos):
+    """
+    Adianta o custo fixo dos relatórios (estilos, métricas das fontes,
+    créditos e imagem de fundo), por exemplo ao subir um processo de
+    renderização, para que o primeiro PDF não pague por ele.
+    """
+    for modelo in modelos:
+        for estilo in estilos(modelo).values():
+            # Mesmo nome normalizado que o Paragraph usa ('Helvetica-bold' -> 'Helvetica-Bold')
+            pdfmetrics.getFont(tt2ps(*ps2tt(estilo.fontName)))
+    creditos_sumer()
+    imagem_template()
+
+
+def elementos_secao(modelo, titulo, noticias, estilos_modelo, numero_inicial=1, fim_da_secao=True):
+    """
+    Título da seção e suas notícias. Uma seção dividida em partes continua
+    a numeração ('numero_inicial') e só a última parte quebra a página.
+    """
+    elementos = [modelo.paragrafo(modelo.titulo_secao(titulo, numero_inicial), "section")]
+    for numero, noticia in enumerate(noticias, numero_inicial):
+        elementos.extend(modelo.elementos_noticia(numero, noticia, estilos_modelo))
+        elementos.append(Spacer(1, modelo.espaco_entre_noticias))
+    if fim_da_secao and modelo.quebra_entre_secoes:
+        elementos.append(PageBreak())
+    return elementos
+
+
+def montar_elementos(modelo, noticias, categoria=None):
+    """Todos os flowables do relatório: capa, seções e créditos."""
+    estilos_modelo = estilos(modelo)
+    elementos = modelo.capa(categoria, estilos_modelo)
+    for titulo, noticias_secao in modelo.secoes(noticias):
+        elementos.extend(elementos_secao(modelo, titulo, noticias_secao, estilos_modelo))
+    if modelo.creditos:
+        elementos.extend(creditos_sumer())
+    return elementos
+
+
+def montar_pdf(modelo, elementos, numerar_paginas=True):
+    """Monta o documento em memória e retorna os bytes do PDF."""
+    saida = io.BytesIO()
+    doc = SimpleDocTemplate(saida, pagesize=A4, **modelo.margens)
+    doc.numerar_paginas = numerar_paginas
+    # Constrói o documento, passando a função do template para 'onFirstPage' e 'onLaterPages'
+    doc.build(
+        elementos,
+        onFirstPage=header_footer_template,
+        onLaterPages=header_footer_template
+    )
+    return saida.getvalue()
+
+
+def gerar_relatorio(modelo, noticias, nome_arquivo, categoria=None):
+    """
+    Gera o relatório e grava em relatorios/ de forma atômica (nunca fica um
+    PDF pela metade). Retorna o caminho do arquivo.
+
+    Não mede o tempo: nos processos do ServicoRenderizacao as métricas não
+    voltam para o processo principal, que mede cada trabalho por conta
+    própria. Quem chama no próprio processo usa gerar_pdf dos modelos.
+    """
+    caminho_completo = caminho_relatorio(nome_arquivo)
+    elementos = montar_elementos(modelo, noticias, categoria)
+    escrever_atomico(caminho_completo, montar_pdf(modelo, elementos))
+    print(f"✅ PDF gerado: {caminho_completo}")
+    return caminho_completo
+
+
+def dividir_em_partes(modelo, noticias, categoria=None, noticias_por_parte=150):
+    """
+    Divide o relatório em partes de até ~'noticias_por_parte' notícias,
+    cortando de preferência entre seções. Só faz sentido em modelos com
+    quebra_entre_secoes (cada parte começa numa página nova). A capa vai na
+    primeira parte e os créditos na última.
+    """
+    partes, blocos, na_parte = [], [], 0
+    for titulo, noticias_secao in modelo.secoes(noticias):
+        inicio = 0
+        while inicio < len(noticias_secao):
+            if na_parte >= noticias_por_parte:
+                partes.append(blocos)
+                blocos, na_parte = [], 0
+            fim = min(len(noticias_secao), inicio + noticias_por_parte - na_parte)
+            blocos.append((titulo, noticias_secao[inicio:fim], inicio + 1,
+                           fim == len(noticias_secao)))
+            na_parte += fim - inicio
+            inicio = fim
+    if blocos or not partes:
+        partes.append(blocos)
+    return [{"modelo": modelo, "categoria": categoria, "capa": i == 0,
+             "creditos": i == len(partes) - 1, "blocos": blocos}
+            for i, blocos in enumerate(partes)]
+
+
+def renderizar_parte(parte):
+    """
+    Renderiza uma parte de um relatório dividido (ver renderizacao.py), sem
+    números de página. 'parte' vem de dividir_em_partes: 'modelo',
+    'categoria', 'capa', 'creditos' e 'blocos': [(título, notícias, número
+    inicial, fim da seção)].
+    """
+    modelo = parte["modelo"]
+    estilos_modelo = estilos(modelo)
+    elementos = modelo.capa(parte["categoria"], estilos_modelo) if parte["capa"] else []
+    for titulo, noticias, numero_inicial, fim_da_secao in parte["blocos"]:
+        elementos.extend(elementos_secao(modelo, titulo, noticias, estilos_modelo,
+                                         numero_inicial, fim_da_secao))
+    if parte["creditos"] and modelo.creditos:
+        elementos.extend(creditos_sumer())
+    return montar_pdf(modelo, elementos, numerar_paginas=False)
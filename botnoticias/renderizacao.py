@@ -0,0 +1,171 @@
+import importlib.util
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from checkpoint import escrever_atomico
+from config import RENDER_NOTICIAS_POR_PARTE, RENDER_PROCESSOS
+from metricas import METRICAS
+from noticia import Noticia
+
+# pypdf só é necessário para juntar as partes de relatórios grandes
+JUNTAR_PARTES = importlib.util.find_spec("pypdf") is not None
+
+
+class TrabalhoPDF(NamedTuple):
+    """Um relatório a renderizar: notícias, nome do arquivo e categoria da capa."""
+    noticias: List[Noticia]
+    nome_arquivo: str
+    categoria: Optional[str] = None
+    # "geral" (pdf_generator, por região) ou "gov" (pdf_generator_gov, por fonte)
+    gerador: str = "geral"
+
+
+def _modelo(gerador):
+    """O ModeloRelatorio de cada gerador."""
+    if gerador == "gov":
+        from pdf_generator_gov import MODELO
+    else:
+        from pdf_generator import MODELO
+    return MODELO
+
+
+def _preparar_processo():
+    """Ao subir cada processo: estilos, fontes, créditos e fundo de uma vez."""
+    from relatorio_pdf import preparar
+    preparar(_modelo("geral"), _modelo("gov"))
+
+
+def _renderizar_inteiro(trabalho: TrabalhoPDF) -> str:
+    """Roda no processo filho: gera e grava o PDF inteiro, retorna o caminho."""
+    from relatorio_pdf import gerar_relatorio
+    return gerar_relatorio(_modelo(trabalho.gerador), trabalho.noticias,
+                           trabalho.nome_arquivo, trabalho.categoria)
+
+
+def _renderizar_parte(parte) -> bytes:
+    """Roda no processo filho: bytes de uma parte (sem números de página)."""
+    from relatorio_pdf import renderizar_parte
+    return renderizar_parte(parte)
+
+
+def juntar_partes(partes: Iterable[bytes]) -> bytes:
+    """
+    Junta os PDFs das partes na ordem e numera as páginas do resultado. O
+    fundo, embutido uma vez em cada parte, é deduplicado na saída.
+    """
+    from pypdf import PdfReader, PdfWriter
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen.canvas import Canvas
+    from relatorio_pdf import desenhar_numero_pagina
+
+    escritor = PdfWriter()
+    for dados in partes:
+        escritor.append(PdfReader(io.BytesIO(dados)))
+
+    # Os números de página são desenhados num PDF à parte e sobrepostos
+    numeros = io.BytesIO()
+    canvas = Canvas(numeros, pagesize=A4)
+    for numero in range(1, len(escritor.pages) + 1):
+        desenhar_numero_pagina(canvas, numero)
+        canvas.showPage()
+    canvas.save()
+    for pagina, numero in zip(escritor.pages, PdfReader(numeros).pages):
+        pagina.merge_page(numero)
+        # merge_page deixa o conteúdo da página descomprimido
+        pagina.compress_content_streams()
+
+    escritor.compress_identical_objects()
+    saida = io.BytesIO()
+    escritor.write(saida)
+    return saida.getvalue()
+
+
+class ServicoRenderizacao:
+    """
+    Renderiza relatórios em processos separados: o layout do ReportLab é
+    Python puro e prende o GIL, então threads não ajudam. Cada relatório é
+    um trabalho no pool; os muito grandes (mais de 'noticias_por_parte'
+    notícias, com mais de um processo e num modelo com quebra entre
+    seções) são divididos em partes entre seções, renderizadas em paralelo
+    e juntadas no processo principal. Todo arquivo é gravado de forma
+    atômica.
+
+    Uso:
+        with ServicoRenderizacao() as servico:
+            futuro = servico.enviar(TrabalhoPDF(noticias, "relatorio.pdf", "Energia"))
+            caminho = futuro.result()
+    """
+
+    def __init__(self, max_processos=RENDER_PROCESSOS, noticias_por_parte=RENDER_NOTICIAS_POR_PARTE):
+        self.noticias_por_parte = noticias_por_parte
+        self.max_processos = max_processos or os.cpu_count() or 1
+        # 'spawn' evita herdar threads e conexões SQLite abertas do processo principal
+        self._processos = ProcessPoolExecutor(
+            max_workers=self.max_processos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preparar_processo)
+        self._juntador = ThreadPoolExecutor(max_workers=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def aquecer(self):
+        """Sobe os processos agora (cada um já prepara estilos, fontes e fundo)."""
+        # Com 'spawn' o pool cria todos os processos no primeiro envio
+        self._processos.submit(os.getpid).result()
+
+    def fechar(self):
+        self._juntador.shutdown(wait=True)
+        self._processos.shutdown(wait=True)
+
+    def _dividir(self, trabalho: TrabalhoPDF):
+        # Juntar as partes custa caro: só compensa com mais de um processo.
+        # E só dá para cortar entre seções quando cada uma já começa numa página nova.
+        modelo = _modelo(trabalho.gerador)
+        if (not modelo.quebra_entre_secoes or not JUNTAR_PARTES or self.max_processos < 2
+                or len(trabalho.noticias) <= self.noticias_por_parte):
+            return None
+        from relatorio_pdf import dividir_em_partes
+        partes = dividir_em_partes(modelo, trabalho.noticias, trabalho.categoria,
+                                   self.noticias_por_parte)
+        return partes if len(partes) > 1 else None
+
+    def enviar(self, trabalho: TrabalhoPDF):
+        """Agenda o relatório; retorna um Future com o caminho do arquivo gravado."""
+        inicio = time.perf_counter()
+        partes = self._dividir(trabalho)
+
+        if partes is None:
+            futuro = self._processos.submit(_renderizar_inteiro, trabalho)
+        else:
+            futuros_partes = [self._processos.submit(_renderizar_parte, parte) for parte in partes]
+
+            def juntar():
+                from relatorio_pdf import caminho_relatorio
+                caminho = caminho_relatorio(trabalho.nome_arquivo)
+                escrever_atomico(caminho, juntar_partes(f.result() for f in futuros_partes))
+                print(f"✅ PDF gerado: {caminho} ({len(partes)} partes)")
+                return caminho
+
+            futuro = self._juntador.submit(juntar)
+
+        def registrar(f):
+            if not f.exception():
+                METRICAS.registrar_tempo("pdf_render", time.perf_counter() - inicio,
+                                         arquivo=trabalho.nome_arquivo)
+        futuro.add_done_callback(registrar)
+        return futuro
+
+
+def renderizar_relatorios(trabalhos: Iterable[TrabalhoPDF], **opcoes) -> Dict[str, str]:
+    """Renderiza todos os trabalhos em paralelo; retorna nome do arquivo -> caminho."""
+    with ServicoRenderizacao(**opcoes) as servico:
+        futuros = {trabalho.nome_arquivo: servico.enviar(trabalho) for trabalho in trabalhos}
+        return {nome: futuro.result() for nome, futuro in futuros.items()}
@@ -70,8 +70,8 @@ def save_pdf(news_list, filename="noticias_estilizadas.pdf", header_img="./image
 
     # Notícias
     for i, news in enumerate(news_list, start=1):
-        title = news.get("title", "Sem título")
-        link = news.get("url", "#")
+        title = news.titulo
+        link = news.link or "#"
 
         # Caixa com título da notícia
         story.append(Paragraph(f"📰 {i}. {title}", news_title_style))
@@ -79,7 +79,7 @@ def save_pdf(news_list, filename="noticias_estilizadas.pdf", header_img="./image
             Paragraph(f"<a href='{link}' color='blue'>{link}</a>", styles['Normal']))
         story.append(Spacer(1, 6))
         story.append(
-            Paragraph(news.get("summary", "Sem resumo disponível."), news_text_style))
+            Paragraph(news.resumo or "Sem resumo disponível.", news_text_style))
 
         # Linha divisória
         data = [[" "]]
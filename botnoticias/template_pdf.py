@@ -0,0 +1,138 @@
+import io
+import os
+import threading
+from copy import copy
+
+import reportlab
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
+
+from checkpoint import escrever_atomico
+from config import PASTA_DADOS, TEMPLATE_LARGURA_MAX, TEMPLATE_QUALIDADE_JPEG
+
+# --- Configuração da Imagem do Template ---
+# Ajuste o caminho conforme necessário para o seu arquivo de imagem
+pasta_images = 'images'
+path = os.path.abspath(os.path.dirname(__file__))
+img_path = os.path.join(path, pasta_images, 'template.png')
+
+# Nome do form XObject com o fundo, dentro de cada PDF
+NOME_FORM_TEMPLATE = "templateFundo"
+
+# Versões (maior.menor) do ReportLab em que o registro direto da imagem já
+# codificada (_desenhar_imagem) foi conferido contra o drawImage. Ele usa
+# internos do canvas; em outras versões o fundo sai pelo drawImage público.
+VERSOES_REPORTLAB_TESTADAS = ("5.0",)
+
+_imagens = {}
+_codificadas = {}
+_lock = threading.Lock()
+_caminho_rapido = ".".join(reportlab.Version.split(".")[:2]) in VERSOES_REPORTLAB_TESTADAS
+
+
+def _recomprimir(origem, largura_max, qualidade):
+    """
+    Gera (uma vez) a versão JPEG reduzida da imagem em dados/ e retorna o
+    caminho. Um arquivo .jpg é embutido pelo ReportLab sem ser decodificado.
+    """
+    from PIL import Image
+
+    destino = os.path.join(PASTA_DADOS, f"template_{largura_max or 'orig'}_q{qualidade}.jpg")
+    if os.path.exists(destino) and os.path.getmtime(destino) >= os.path.getmtime(origem):
+        return destino
+
+    with Image.open(origem) as imagem:
+        imagem = imagem.convert("RGB")
+        if largura_max and imagem.width > largura_max:
+            altura = round(imagem.height * largura_max / imagem.width)
+            imagem = imagem.resize((largura_max, altura), Image.LANCZOS)
+        saida = io.BytesIO()
+        imagem.save(saida, "JPEG", quality=qualidade, optimize=True)
+    escrever_atomico(destino, saida.getvalue())
+    return destino
+
+
+def imagem_template(origem=img_path, largura_max=TEMPLATE_LARGURA_MAX,
+                    qualidade=TEMPLATE_QUALIDADE_JPEG):
+    """
+    A imagem de fundo pronta para o drawImage, preparada uma vez por
+    processo: um ImageReader já decodificado ou, com 'qualidade' (JPEG) ou
+    'largura_max', o caminho da cópia recomprimida.
+    """
+    chave = (origem, largura_max, qualidade)
+    with _lock:
+        if chave not in _imagens:
+            if qualidade or largura_max:
+                _imagens[chave] = _recomprimir(origem, largura_max, qualidade or 85)
+            else:
+                _imagens[chave] = ImageReader(origem)
+        return _imagens[chave]
+
+
+def _imagem_codificada(imagem):
+    """
+    O XObject da imagem já comprimido, criado uma vez por processo. Sem ele
+    o ReportLab comprime a imagem inteira de novo a cada PDF (zlib e
+    ASCII85, este em Python puro quando falta o _rl_accel).
+    """
+    with _lock:
+        if imagem not in _codificadas:
+            nome = f"templateImagem{len(_codificadas)}"
+            objeto = PDFImageXObject(nome, imagem)
+            objeto.name = nome
+            _codificadas[imagem] = objeto
+        return _codificadas[imagem]
+
+
+def _registrar_imagem(canvas, imagem, largura, altura):
+    """
+    Como o canvas.drawImage, mas registrando no PDF o XObject já codificado.
+    Usa internos do canvas do ReportLab (_doc, _code, _formsinuse).
+    """
+    # Cópia rasa por PDF (o documento marca o objeto que registra); os
+    # bytes comprimidos são compartilhados
+    objeto = copy(_imagem_codificada(imagem))
+    documento = canvas._doc
+    nome_registro = documento.getXObjectName(objeto.name)
+    if nome_registro not in documento.idToObject:
+        documento.Reference(objeto, nome_registro)
+        documento.addForm(objeto.name, objeto)
+    canvas.saveState()
+    canvas.scale(largura, altura)
+    canvas._code.append(f"/{nome_registro} Do")
+    canvas.restoreState()
+    canvas._formsinuse.append(objeto.name)
+
+
+def _desenhar_imagem(canvas, imagem, largura, altura):
+    """
+    Desenha a imagem na página inteira: pelo XObject já codificado nas
+    versões testadas do ReportLab e pelo drawImage público nas demais ou
+    se o caminho rápido falhar (aí ele fica desligado até o fim do processo).
+    """
+    global _caminho_rapido
+    if _caminho_rapido:
+        try:
+            _registrar_imagem(canvas, imagem, largura, altura)
+            return
+        except Exception as e:
+            _caminho_rapido = False
+            print(f"⚠️ Fundo pelo drawImage (registro direto falhou: {type(e).__name__}: {e})")
+    canvas.drawImage(imagem, 0, 0, width=largura, height=altura)
+
+
+def desenhar_template(canvas, imagem=None):
+    """
+    Desenha o fundo da página inteira. A imagem vira um único form XObject
+    por documento, criado na primeira página; as demais só o referenciam,
+    sem decodificar, calcular o hash nem embutir a imagem de novo. A imagem
+    comprimida é a mesma para todos os PDFs do processo.
+    """
+    if not canvas.hasForm(NOME_FORM_TEMPLATE):
+        page_width, page_height = A4
+        canvas.beginForm(NOME_FORM_TEMPLATE, lowerx=0, lowery=0, upperx=page_width,
+                         uppery=page_height)
+        _desenhar_imagem(canvas, imagem or imagem_template(), page_width, page_height)
+        canvas.endForm()
+    canvas.doForm(NOME_FORM_TEMPLATE)
@@ -1,5 +1,6 @@
 from datetime import datetime
 from pdf_generator import gerar_pdf
+from noticia import Noticia
 
 sample_noticias = [
     {
@@ -40,6 +41,6 @@ sample_noticias = [
     }
 ]
 
-gerar_pdf(sample_noticias,
+gerar_pdf([Noticia.de_dict(n) for n in sample_noticias],
           nome_arquivo=f"testePDFgerar_{datetime.now().strftime('%d-%m-%Y')}.pdf", categoria="Teste")
 print("pdf gerado")
@@ -9,10 +9,10 @@ from ia_filter import filtrar_e_resumir_noticia
 
 def imprimir_noticias(noticias):
     for noticia in noticias:
-        print(f"Título: {noticia['titulo']}")
-        print(f"Fonte: {noticia['fonte']}")
-        print(f"Link: {noticia['link']}")
-        print(f"Data: {noticia['data']}")
+        print(f"Título: {noticia.titulo}")
+        print(f"Fonte: {noticia.fonte}")
+        print(f"Link: {noticia.link}")
+        print(f"Data: {noticia.data_formatada}")
         print("-" * 40)
 
 
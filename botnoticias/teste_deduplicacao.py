@@ -0,0 +1,76 @@
+import random
+import string
+from difflib import SequenceMatcher
+
+from coleta import verificar_similaridade
+from deduplicacao import IndiceTitulos
+
+PALAVRAS = [
+    "energia", "solar", "eólica", "petróleo", "gás", "natural", "usina", "leilão",
+    "mineração", "minério", "ferro", "lítio", "ouro", "Piauí", "Nordeste", "Brasil",
+    "Petrobras", "ANEEL", "tarifa", "transmissão", "hidrogênio", "verde", "de", "da",
+    "em", "no", "para", "com", "e", "a", "o", "bilhões", "recorde", "produção",
+]
+
+
+def variar(titulo, rnd):
+    """Edita alguns caracteres ou palavras, para cair perto do limite de similaridade."""
+    caracteres = list(titulo)
+    for _ in range(rnd.randint(1, max(len(caracteres) // 8, 1))):
+        posicao = rnd.randrange(len(caracteres) + 1)
+        operacao = rnd.random()
+        if operacao < 0.4 and posicao < len(caracteres):
+            del caracteres[posicao]
+        elif operacao < 0.8:
+            caracteres.insert(posicao, rnd.choice(string.ascii_lowercase + " "))
+        elif posicao < len(caracteres):
+            caracteres[posicao] = rnd.choice(string.ascii_lowercase)
+    variado = "".join(caracteres)
+    if rnd.random() < 0.2:
+        palavras = variado.split()
+        rnd.shuffle(palavras)
+        variado = " ".join(palavras)
+    return variado or titulo
+
+
+CONSULTAS = 2000
+
+
+def titulo_aleatorio(rnd):
+    tamanho = rnd.choice([1, 2, 3, 5, 8, 12, 16])  # Inclui títulos bem curtos
+    return " ".join(rnd.choice(PALAVRAS) for _ in range(tamanho))
+
+
+def varredura_linear(titulo, titulos, limite):
+    """
+    Mesma regra de verificar_similaridade com uma lista comum. Os testes
+    rápidos do SequenceMatcher são limites superiores do ratio: não mudam a
+    resposta, só evitam calcular o ratio à toa.
+    """
+    titulo_low = titulo.lower()
+    for existente in titulos:
+        matcher = SequenceMatcher(None, titulo_low, existente.lower())
+        if (matcher.real_quick_ratio() >= limite and matcher.quick_ratio() >= limite
+                and matcher.ratio() >= limite):
+            return True
+    return False
+
+
+if __name__ == '__main__':
+    # Cada consulta é uma variação de um único título do índice, perto do
+    # limite: um par que o índice deixe escapar aparece como divergência.
+    # (Uma busca aproximada, como o MinHash/LSH, falha em ~0,2% dos pares.)
+    for seed, limite in ((0, 0.85), (1, 0.85), (2, 0.85), (3, 0.7)):
+        rnd = random.Random(seed)
+        titulos = [titulo_aleatorio(rnd) for _ in range(200)]
+        indice = IndiceTitulos(titulos, limite=limite)
+        similares = 0
+        for _ in range(CONSULTAS):
+            consulta = variar(rnd.choice(titulos), rnd)
+            esperado = varredura_linear(consulta, titulos, limite)
+            obtido = verificar_similaridade(consulta, indice, limite=limite)
+            assert obtido == esperado, f"seed {seed}, limite {limite}: {consulta!r}"
+            similares += esperado
+        print(f"seed {seed}, limite {limite}: {similares} de {CONSULTAS} similares, iguais à varredura")
+        assert similares > CONSULTAS // 2, "Poucas consultas similares para o teste valer"
+    print("Índice idêntico à varredura linear.")
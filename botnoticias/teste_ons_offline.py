@@ -0,0 +1,43 @@
+import json
+import os
+from datetime import date
+
+from coleta_ons import extrair_noticias_html, extrair_noticias_json
+
+# Gravações da página renderizada e da listagem em JSON do ONS
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ons")
+# Data fixa para o filtro de 7 dias dar sempre o mesmo resultado
+HOJE = date(2025, 10, 17)
+
+
+def carregar(nome):
+    with open(os.path.join(PASTA_FIXTURES, nome), encoding="utf-8") as f:
+        return f.read()
+
+
+if __name__ == '__main__':
+    via_navegador = extrair_noticias_html(carregar("noticias_renderizada.html"), HOJE)
+    via_http = extrair_noticias_json(json.loads(carregar("noticias_api.json")), HOJE)
+
+    print(f"Selenium (HTML renderizado): {len(via_navegador)} notícias")
+    print(f"HTTP (JSON):                 {len(via_http)} notícias")
+
+    for a, b in zip(via_navegador, via_http):
+        marca = "✅" if a == b else "❌"
+        print(f"{marca} {a.data_formatada} | {a.titulo}")
+        if a != b:
+            for campo, valor in a.para_dict().items():
+                if valor != b.para_dict()[campo]:
+                    print(f"     {campo}: {valor!r} != {b.para_dict()[campo]!r}")
+
+    assert via_navegador == via_http, "Os dois caminhos do ONS deram resultados diferentes"
+    assert len(via_navegador) == 3, "Esperadas 3 notícias dentro da janela de 7 dias"
+    assert extrair_noticias_json({"value": [{"Campo": "novo formato"}]}, HOJE) is None
+    # Template sem renderizar ou página de erro com link para as notícias: sem
+    # nenhum item reconhecível, o HTTP devolve None e o Selenium assume
+    template = ('<div class="noticia"><div class="data"><p>{{dia}}</p><span>{{mes}}</span></div>'
+                '<div class="info"><a href="{{link}}">{{titulo}}</a><p>{{resumo}}</p></div></div>')
+    assert extrair_noticias_html(template, HOJE) is None
+    erro = '<nav><a href="/paginas/imprensa/noticias">Notícias</a></nav><h1>Erro 503</h1>'
+    assert extrair_noticias_html(erro, HOJE) is None
+    print("Saída idêntica nos dois caminhos.")